@@ -1,9 +1,13 @@
 """
 Agent - Main agentic loop with tool execution.
 """
-import json
+import hashlib
+import inspect
 import re
-from typing import Dict, Any, Callable, Optional, Generator
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Generator, Tuple
+from goal_tracker import GoalTracker
 from ollama_client import OllamaClient, SYSTEM_PROMPT
 from tools.browser import get_browser
 from tools.filesystem import get_filesystem
@@ -11,15 +15,207 @@ from tools.grading import get_grading
 from tools.gamecontrol import get_gamecontrol
 from tools.vision import get_vision
 
+# orjson is optional - fall back to the stdlib parser
+try:
+    from orjson import loads as _json_loads, JSONDecodeError as _JSONDecodeError
+except ImportError:
+    from json import loads as _json_loads, JSONDecodeError as _JSONDecodeError
+
+
+# Precompiled patterns (the agent loop runs these on every LLM response)
+_XML_TOOL_CALL = re.compile(r"<tool_call>\s*\n?(.*?)\n?</tool_call>", re.DOTALL)
+_MD_TOOL_CALL = re.compile(r"```tool_call\s*\n?(.*?)\n?```", re.DOTALL)
+# Every tagged part of a response, for the single-pass split in _split_response
+_RESPONSE_PARTS = re.compile(
+    r"<think>(.*?)</think>"
+    r"|<tool_call>\s*\n?(.*?)\n?</tool_call>"
+    r"|```tool_call\s*\n?(.*?)\n?```",
+    re.DOTALL,
+)
+_TRAILING_PROTOCOL = re.compile(r"\s*Use THINK to plan.*$", re.IGNORECASE)
+
+# Natural language tool intent, e.g. "use browser_navigate with url https://example.com"
+_NL_PATTERNS = [(re.compile(p, re.IGNORECASE), fn) for p, fn in [
+    # browser_navigate patterns
+    (r"(?:use|call)\s+browser_navigate\s+(?:to|with\s+url\s+)?[\"']?(https?://[^\s\"']+)[\"']?",
+     lambda m: {"tool": "browser_navigate", "args": {"url": m.group(1)}}),
+    (r"navigate\s+to\s+[\"']?(https?://[^\s\"']+)[\"']?",
+     lambda m: {"tool": "browser_navigate", "args": {"url": m.group(1)}}),
+    (r"go\s+to\s+[\"']?(https?://[^\s\"']+)[\"']?",
+     lambda m: {"tool": "browser_navigate", "args": {"url": m.group(1)}}),
+    # browser_get_content
+    (r"(?:use|call)\s+browser_get_content",
+     lambda m: {"tool": "browser_get_content", "args": {}}),
+    (r"get\s+(?:page\s+)?content",
+     lambda m: {"tool": "browser_get_content", "args": {}}),
+    # screenshot
+    (r"(?:take|get|use)\s+screenshot",
+     lambda m: {"tool": "screenshot", "args": {}}),
+]]
+
+# Model says it will do something but didn't include a tool call,
+# or is reasoning about the response format instead of acting
+_INCOMPLETE_PATTERNS = [
+    r"(?:first|next|now)\s+(?:step|I\s+will|I'll|let me|I\s+need)",
+    r"^(?:so\s+)?(?:first|let me|I will|I'll|I need to|I should|I'm going to)",
+    r"plan(?:ning)?\s+(?:my\s+)?approach",
+    r"(?:will|going to|need to)\s+(?:use|call|try|execute)\s+(?:the\s+)?(?:tool|browser|file)",
+    r"^step\s+\d+:",
+    r"my approach (?:is|will be)",
+    # Meta-reasoning about format (model is confused)
+    r"(?:THINK|THINKING)\s*(?:tag|with|using)",
+    r"produce\s+(?:THINK|FINAL|response)",
+    r"(?:inside|outside)\s+(?:the\s+)?(?:tag|think)",
+    r"response\s+format",
+    r"we\s+(?:can|should|need to)\s+(?:respond|output|produce)",
+    r"per\s+instructions",
+    # Natural language tool descriptions (model says what tool but doesn't call it)
+    r"(?:use|call|try)\s+browser_",
+    r"(?:use|call|try)\s+file_",
+    r"(?:use|call|try)\s+game_",
+    r"(?:use|call|try)\s+screenshot",
+    r"we(?:'ll)?\s+need\s+to",
+    r"likely\s+(?:we|I)\s+need",
+    r"then\s+(?:maybe\s+)?browser_",
+    r"fetch\s+content\s+first",
+]
+# Only a yes/no is needed, so scan once with a single alternation
+_INCOMPLETE_RESPONSE = re.compile("|".join(f"(?:{p})" for p in _INCOMPLETE_PATTERNS), re.IGNORECASE)
+
+# Final answers hidden inside Nemotron's <think> block
+_FINAL_PATTERNS = [re.compile(p, re.IGNORECASE | re.DOTALL) for p in [
+    r"FINAL ANSWER[:\s]*(.+?)(?:$|\n\n)",
+    r"Thus[,:\s]+(?:the )?(?:final )?(?:answer|response|result)[:\s]*(.+?)(?:$|\n\n)",
+    r"(?:In conclusion|Therefore|To summarize)[,:\s]*(.+?)(?:$|\n\n)",
+]]
+
+
+def _split_response(response: str) -> Tuple[Optional[str], str, List[str], List[str]]:
+    """
+    Split a raw model response in one pass.
+    Returns (first <think> body, text outside think/tool_call blocks,
+    <tool_call> bodies, ```tool_call bodies). Tool calls drafted inside <think>
+    are only used when the response has no top-level tool call blocks.
+    """
+    if "<think>" not in response and "tool_call" not in response:
+        return None, response.strip(), [], []
+    
+    thought = None
+    clean = []
+    xml_blocks: List[str] = []
+    md_blocks: List[str] = []
+    think_xml: List[str] = []
+    think_md: List[str] = []
+    pos = 0
+    for m in _RESPONSE_PARTS.finditer(response):
+        clean.append(response[pos:m.start()])
+        pos = m.end()
+        if m.lastindex == 1:
+            body = m.group(1)
+            if thought is None:
+                thought = body.strip()
+            # Nemotron's thinking field can carry the tool call itself (often a draft
+            # of the one it then emits in the content)
+            if "<tool_call>" in body:
+                think_xml.extend(t.group(1).strip() for t in _XML_TOOL_CALL.finditer(body))
+            if "```tool_call" in body:
+                think_md.extend(t.group(1).strip() for t in _MD_TOOL_CALL.finditer(body))
+        elif m.lastindex == 2:
+            xml_blocks.append(m.group(2).strip())
+        else:
+            md_blocks.append(m.group(3).strip())
+    clean.append(response[pos:])
+    if not xml_blocks and not md_blocks:
+        xml_blocks, md_blocks = think_xml, think_md
+    return thought, "".join(clean).strip(), xml_blocks, md_blocks
+
+
+def _find_json_object(text: str) -> Optional[str]:
+    """
+    Return the first brace-balanced {...} span in text (string literals honoured).
+    Single pass with no backtracking, unlike a greedy DOTALL regex.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+class _PromptCache:
+    """
+    Exact-match LLM response cache.
+    Keyed on everything that reaches the model, so a hit only happens when the
+    whole conversation so far is identical (e.g. re-running the same task).
+    Only consulted at temperature 0 - a sampled reply is not "the" answer to replay.
+    """
+    
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.exact: OrderedDict[str, str] = OrderedDict()
+    
+    def key(self, client: OllamaClient, prompt: str) -> str:
+        raw = repr((client.model, client.temperature, client.num_predict,
+                    client.system_prompt, client.conversation_history, prompt))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        response = self.exact.get(key)
+        if response is not None:
+            self.exact.move_to_end(key)
+        return response
+    
+    def put(self, key: str, response: str):
+        self.exact[key] = response
+        self.exact.move_to_end(key)
+        if len(self.exact) > self.max_entries:
+            self.exact.popitem(last=False)
+    
+    def clear(self):
+        self.exact.clear()
+
 
 class Agent:
     """Agentic AI with tool-calling capabilities."""
     
+    # Read-only tools that may run in parallel when the model emits several calls at once.
+    # Browser tools are excluded: Playwright's sync API is bound to the thread that started it.
+    CONCURRENCY_SAFE = frozenset({
+        "file_read", "file_list", "file_search",
+        "list_rubrics", "load_rubric",
+        "game_list_windows", "game_pixel_color",
+    })
+    
     def __init__(self, model: str = "nemotron-3-nano:latest"):
         self.client = OllamaClient(model)
+        # Per-tool signature info, filled once at registration
+        self._tool_param_names: Dict[str, frozenset] = {}
+        self._tool_accepts_kwargs: Dict[str, bool] = {}
         self.tools = self._register_tools()
         self.max_iterations = 10
         self.verbose = True
+        self.prompt_cache = _PromptCache()
+        self._executor = ThreadPoolExecutor(max_workers=8)
     
     def _register_tools(self) -> Dict[str, Callable]:
         """Register all available tools."""
@@ -29,7 +225,7 @@ class Agent:
         game = get_gamecontrol()
         vision = get_vision()
         
-        return {
+        tools = {
             # Browser tools
             "browser_navigate": lambda url: browser.navigate(url),
             "browser_click": lambda selector=None, x=None, y=None: browser.click(selector, x, y),
@@ -67,6 +263,16 @@ class Agent:
             # Human interaction tools
             "wait_for_human": lambda reason="": f"HUMAN_TAKEOVER_REQUESTED: {reason}",
         }
+        
+        for name, fn in tools.items():
+            self._cache_signature(name, fn)
+        return tools
+    
+    def _cache_signature(self, tool_name: str, tool_fn: Callable):
+        """Remember which keyword arguments a tool accepts."""
+        params = inspect.signature(tool_fn).parameters
+        self._tool_accepts_kwargs[tool_name] = any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
+        self._tool_param_names[tool_name] = frozenset(params)
     
     def execute_tool(self, tool_name: str, args: Dict[str, Any]) -> str:
         """Execute a tool and return the result, ignoring unexpected arguments."""
@@ -74,20 +280,20 @@ class Agent:
             return f"Error: Unknown tool '{tool_name}'"
         
         try:
-            import inspect
             tool_fn = self.tools[tool_name]
+            # Tools added to self.tools after registration get their signature cached on first use
+            if tool_name not in self._tool_param_names:
+                self._cache_signature(tool_name, tool_fn)
             
             # Intelligently filter arguments to match what the tool actually accepts
             # This handles models hallucinating extra arguments (like 'url' for browser_get_content)
-            sig = inspect.signature(tool_fn)
-            params = sig.parameters
-            
             # If the tool takes **kwargs, we can pass everything
-            if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in params.values()):
+            if self._tool_accepts_kwargs[tool_name]:
                 filtered_args = args
             else:
                 # Otherwise, only pass what's in the signature
-                filtered_args = {k: v for k, v in args.items() if k in params}
+                names = self._tool_param_names[tool_name]
+                filtered_args = {k: args[k] for k in args.keys() & names}
                 
                 # Check for positional-only arguments (rare in our lambdas but good to have)
                 # Our tools are mostly lambdas with keyword support, so this simplified filtering is usually enough
@@ -97,84 +303,129 @@ class Agent:
         except Exception as e:
             return f"Error executing {tool_name}: {e}"
     
+    def _group_tool_calls(self, tool_calls: List[Dict]) -> List[List[Dict]]:
+        """Split calls into ordered groups: runs of concurrency-safe tools, or single other tools."""
+        groups = []
+        for call in tool_calls:
+            safe = call.get("tool") in self.CONCURRENCY_SAFE
+            if safe and groups and groups[-1][0].get("tool") in self.CONCURRENCY_SAFE:
+                groups[-1].append(call)
+            else:
+                groups.append([call])
+        return groups
+    
+    def _execute_group(self, group: List[Dict]) -> List[str]:
+        """Execute a group of tool calls, returning results in input order."""
+        if len(group) == 1:
+            call = group[0]
+            return [self.execute_tool(call.get("tool", ""), call.get("args", {}))]
+        return list(self._executor.map(
+            lambda call: self.execute_tool(call.get("tool", ""), call.get("args", {})), group
+        ))
+    
+    def reset(self):
+        """Forget the conversation and every cached LLM response."""
+        self.client.reset_conversation()
+        self.prompt_cache.clear()
+    
+    def _chat(self, prompt: str) -> str:
+        """Send a prompt to the LLM, reusing the cached response for an identical conversation."""
+        # Sampled replies (and a world changed by earlier tool calls) must not be replayed
+        if self.client.temperature != 0:
+            return self.client.chat(prompt)
+        
+        key = self.prompt_cache.key(self.client, prompt)
+        response = self.prompt_cache.get(key)
+        if response is not None:
+            if self.verbose:
+                print("[DEBUG] Prompt cache hit")
+            self.client.add_exchange(prompt, response)
+            return response
+        
+        response = self.client.chat(prompt)
+        if response.strip():
+            self.prompt_cache.put(key, response)
+        return response
+    
     def parse_tool_call(self, response: str) -> Optional[Dict]:
-        """Extract tool call from response using XML tags or markdown fallback."""
-        # 1. Try to find <tool_call> ... </tool_call> blocks (Official NVIDIA protocol)
-        xml_pattern = r"<tool_call>\s*\n?(.*?)\n?</tool_call>"
-        xml_match = re.search(xml_pattern, response, re.DOTALL)
+        """Extract the first tool call from response using XML tags or markdown fallback."""
+        calls = self.parse_tool_calls(response)
+        return calls[0] if calls else None
+    
+    def parse_tool_calls(self, response: str) -> List[Dict]:
+        """Extract every tool call from response (several tagged blocks or a tool_calls array)."""
+        _, _, xml_blocks, md_blocks = _split_response(response)
+        return self._collect_tool_calls(response, xml_blocks, md_blocks)
+    
+    def _collect_tool_calls(self, response: str, xml_blocks: List[str], md_blocks: List[str]) -> List[Dict]:
+        """Turn pre-split tool_call blocks (or fallbacks found in response) into tool calls."""
+        # 1. <tool_call> ... </tool_call> blocks (Official NVIDIA protocol)
+        # 2. Markdown fallback: ```tool_call ... ``` blocks
+        blocks = xml_blocks or md_blocks
+        if not blocks and "{" in response:
+            # 3. Last resort: Look for any JSON-like object
+            json_content = _find_json_object(response)
+            if json_content:
+                blocks = [json_content]
         
-        json_content = None
-        if xml_match:
-            json_content = xml_match.group(1).strip()
-        else:
-            # 2. Markdown fallback: Try to find ```tool_call ... ``` blocks
-            md_pattern = r"```tool_call\s*\n?(.*?)\n?```"
-            md_match = re.search(md_pattern, response, re.DOTALL)
-            if md_match:
-                json_content = md_match.group(1).strip()
-            else:
-                # 3. Last resort: Look for any JSON-like object
-                json_pattern = r"\{.*\}"
-                json_match = re.search(json_pattern, response, re.DOTALL)
-                if json_match:
-                    json_content = json_match.group(0).strip()
-
-        if json_content:
-            try:
-                data = json.loads(json_content)
-                
-                # Normalize format: Support {"tool": "...", "args": {}} 
-                # AND NVIDIA/OpenAI style {"name": "...", "arguments": {}}
-                tool_name = data.get("tool") or data.get("name")
-                tool_args = data.get("args") or data.get("arguments") or {}
-                
-                if tool_name:
-                    return {"tool": tool_name, "args": tool_args}
-                    
-                # Nested OpenAI style {"tool_calls": [...]}
-                if "tool_calls" in data and isinstance(data["tool_calls"], list):
-                    call = data["tool_calls"][0]
-                    nested_name = call.get("name") or call.get("function", {}).get("name")
-                    nested_args = call.get("arguments") or call.get("function", {}).get("arguments") or {}
-                    if nested_name:
-                        return {"tool": nested_name, "args": nested_args}
-                        
-            except json.JSONDecodeError:
-                pass
+        # Identical (tool, args) pairs run once - side-effecting tools must not repeat
+        calls = []
+        seen = set()
+        for json_content in blocks:
+            for call in self._tool_calls_from_json(json_content):
+                call_key = repr((call["tool"], call["args"]))
+                if call_key not in seen:
+                    seen.add(call_key)
+                    calls.append(call)
+        if calls:
+            return calls
         
         # 4. NATURAL LANGUAGE EXTRACTION: Try to extract tool intent from plain English
-        # E.g. "use browser_navigate with url https://example.com"
-        nl_patterns = [
-            # browser_navigate patterns
-            (r"(?:use|call)\s+browser_navigate\s+(?:to|with\s+url\s+)?[\"']?(https?://[^\s\"']+)[\"']?",
-             lambda m: {"tool": "browser_navigate", "args": {"url": m.group(1)}}),
-            (r"navigate\s+to\s+[\"']?(https?://[^\s\"']+)[\"']?",
-             lambda m: {"tool": "browser_navigate", "args": {"url": m.group(1)}}),
-            (r"go\s+to\s+[\"']?(https?://[^\s\"']+)[\"']?",
-             lambda m: {"tool": "browser_navigate", "args": {"url": m.group(1)}}),
-            # browser_get_content
-            (r"(?:use|call)\s+browser_get_content",
-             lambda m: {"tool": "browser_get_content", "args": {}}),
-            (r"get\s+(?:page\s+)?content",
-             lambda m: {"tool": "browser_get_content", "args": {}}),
-            # screenshot
-            (r"(?:take|get|use)\s+screenshot",
-             lambda m: {"tool": "screenshot", "args": {}}),
-        ]
-        
-        for pattern, extractor in nl_patterns:
-            match = re.search(pattern, response, re.IGNORECASE)
+        for pattern, extractor in _NL_PATTERNS:
+            match = pattern.search(response)
             if match:
-                return extractor(match)
+                return [extractor(match)]
                 
-        return None
+        return []
+    
+    def _tool_calls_from_json(self, json_content: str) -> List[Dict]:
+        """Normalize one JSON tool-call blob into a list of {"tool", "args"} dicts."""
+        # Cheap shape check before handing the blob to the parser
+        if not (json_content.startswith("{") and json_content.endswith("}")):
+            return []
+        try:
+            data = _json_loads(json_content)
+        except _JSONDecodeError:
+            return []
+        
+        # Normalize format: Support {"tool": "...", "args": {}} 
+        # AND NVIDIA/OpenAI style {"name": "...", "arguments": {}}
+        tool_name = data.get("tool") or data.get("name")
+        tool_args = data.get("args") or data.get("arguments") or {}
+        
+        if tool_name:
+            return [{"tool": tool_name, "args": tool_args}]
+        
+        # Nested OpenAI style {"tool_calls": [...]}
+        calls = []
+        if isinstance(data.get("tool_calls"), list):
+            for call in data["tool_calls"]:
+                if not isinstance(call, dict):
+                    continue
+                function = call.get("function")
+                if not isinstance(function, dict):
+                    function = {}
+                nested_name = call.get("name") or function.get("name")
+                nested_args = call.get("arguments") or function.get("arguments") or {}
+                if nested_name:
+                    calls.append({"tool": nested_name, "args": nested_args})
+        return calls
     
     def run(self, task: str) -> Generator[Dict[str, Any], None, None]:
         """
         Run the agent loop for a task.
         Yields status updates for each step.
         """
-        from goal_tracker import GoalTracker
         tracker = GoalTracker(task)
         
         self.client.reset_conversation()
@@ -188,61 +439,23 @@ class Agent:
         
         while iteration < self.max_iterations:
             # Get response from LLM
-            response = self.client.chat(current_prompt)
+            response = self._chat(current_prompt)
             if self.verbose:
                 print(f"[DEBUG] Iteration {iteration} Raw: {response[:200]}...")
             
-            # 1. Extract and yield thoughts (<think> tags)
-            think_match = re.search(r"<think>(.*?)</think>", response, re.DOTALL)
-            if think_match:
-                thought = think_match.group(1).strip()
-                if thought:
-                    yield {"type": "thought", "content": thought}
-            
-            # 2. Extract content outside of tags
-            clean_content = re.sub(r"<(think|tool_call)>.*?</\1>", "", response, flags=re.DOTALL).strip()
-            # Also clean markdown versions
-            clean_content = re.sub(r"```tool_call.*?```", "", clean_content, flags=re.DOTALL).strip()
+            # 1-2. Split thoughts (<think> tags), content outside of tags and tool call blocks in one pass
+            thought, clean_content, xml_blocks, md_blocks = _split_response(response)
+            if thought:
+                yield {"type": "thought", "content": thought}
             
-            # 3. Check for tool call
-            tool_call = self.parse_tool_call(response)
+            # 3. Check for tool call(s)
+            tool_calls = self._collect_tool_calls(response, xml_blocks, md_blocks)
             
-            if not tool_call:
+            if not tool_calls:
                 # No tool call - but is this actually a final answer or an incomplete response?
                 
                 # DETECT INCOMPLETE RESPONSES: Model says it will do something but didn't include tool call
-                # Also detect meta-reasoning about format (model confused about HOW to respond)
-                incomplete_patterns = [
-                    r"(?:first|next|now)\s+(?:step|I\s+will|I'll|let me|I\s+need)",
-                    r"^(?:so\s+)?(?:first|let me|I will|I'll|I need to|I should|I'm going to)",
-                    r"plan(?:ning)?\s+(?:my\s+)?approach",
-                    r"(?:will|going to|need to)\s+(?:use|call|try|execute)\s+(?:the\s+)?(?:tool|browser|file)",
-                    r"^step\s+\d+:",
-                    r"my approach (?:is|will be)",
-                    # Meta-reasoning about format (model is confused)
-                    r"(?:THINK|THINKING)\s*(?:tag|with|using)",
-                    r"produce\s+(?:THINK|FINAL|response)",
-                    r"(?:inside|outside)\s+(?:the\s+)?(?:tag|think)",
-                    r"response\s+format",
-                    r"we\s+(?:can|should|need to)\s+(?:respond|output|produce)",
-                    r"per\s+instructions",
-                    # Natural language tool descriptions (model says what tool but doesn't call it)
-                    r"(?:use|call|try)\s+browser_",
-                    r"(?:use|call|try)\s+file_",
-                    r"(?:use|call|try)\s+game_",
-                    r"(?:use|call|try)\s+screenshot",
-                    r"we(?:'ll)?\s+need\s+to",
-                    r"likely\s+(?:we|I)\s+need",
-                    r"then\s+(?:maybe\s+)?browser_",
-                    r"fetch\s+content\s+first",
-                ]
-                
-                is_incomplete = False
-                if clean_content:
-                    for pattern in incomplete_patterns:
-                        if re.search(pattern, clean_content, re.IGNORECASE):
-                            is_incomplete = True
-                            break
+                is_incomplete = bool(clean_content) and _INCOMPLETE_RESPONSE.search(clean_content) is not None
                 
                 if is_incomplete:
                     # Model intended to continue but didn't include a tool call
@@ -259,20 +472,14 @@ class Agent:
                 # Check if the model put its FINAL ANSWER inside <think> tags
                 # This is a common pattern with Nemotron's native thinking mode
                 final_answer = None
-                if think_match:
-                    thought = think_match.group(1).strip()
+                if thought is not None:
                     # Look for "FINAL ANSWER:" pattern in thinking
-                    final_patterns = [
-                        r"FINAL ANSWER[:\s]*(.+?)(?:$|\n\n)",
-                        r"Thus[,:\s]+(?:the )?(?:final )?(?:answer|response|result)[:\s]*(.+?)(?:$|\n\n)",
-                        r"(?:In conclusion|Therefore|To summarize)[,:\s]*(.+?)(?:$|\n\n)"
-                    ]
-                    for pattern in final_patterns:
-                        match = re.search(pattern, thought, re.IGNORECASE | re.DOTALL)
+                    for pattern in _FINAL_PATTERNS:
+                        match = pattern.search(thought)
                         if match:
                             final_answer = match.group(1).strip()
                             # Clean up any trailing protocol instructions
-                            final_answer = re.sub(r"\s*Use THINK to plan.*$", "", final_answer, flags=re.IGNORECASE)
+                            final_answer = _TRAILING_PROTOCOL.sub("", final_answer)
                             if len(final_answer) > 10:  # Only use if substantial
                                 break
                             else:
@@ -290,8 +497,7 @@ class Agent:
                         final_text = f"Goal achieved using {last_tool_name}. Final status:\n\n{last_tool_result[:1500]}"
                     else:
                         # Last resort: summarize from the thought if available
-                        if think_match:
-                            thought = think_match.group(1).strip()
+                        if thought is not None:
                             # Take the last substantial sentence as summary
                             sentences = [s.strip() for s in thought.split('.') if len(s.strip()) > 20]
                             if sentences:
@@ -306,27 +512,28 @@ class Agent:
             if clean_content:
                 yield {"type": "response", "content": clean_content}
             
-            # 5. Execute tool
-            tool_name = tool_call.get("tool", "")
-            tool_args = tool_call.get("args", {})
-            
-            yield {"type": "tool_call", "tool": tool_name, "args": tool_args}
-            
-            result = self.execute_tool(tool_name, tool_args)
-            tracker.add_action(tool_name, tool_args, result)
-            
-            last_tool_result = result
-            last_tool_name = tool_name
-            yield {"type": "tool_result", "tool": tool_name, "result": result}
-            
-            # 6. REFLECT: Feed result back and continue loop with a progress check
-            self.client.add_tool_result(tool_name, result)
+            # 5. Execute tool(s) - read-only calls in a row run concurrently
+            for group in self._group_tool_calls(tool_calls):
+                for call in group:
+                    yield {"type": "tool_call", "tool": call.get("tool", ""), "args": call.get("args", {})}
+                
+                for call, result in zip(group, self._execute_group(group)):
+                    tool_name = call.get("tool", "")
+                    tool_args = call.get("args", {})
+                    tracker.add_action(tool_name, tool_args, result)
+                    
+                    last_tool_result = result
+                    last_tool_name = tool_name
+                    yield {"type": "tool_result", "tool": tool_name, "result": result}
+                    
+                    # 6. REFLECT: Feed result back and continue loop with a progress check
+                    self.client.add_tool_result(tool_name, result)
             
             # Check for looping behavior
             if tracker.check_for_loop():
-                current_prompt = f"LOOP DETECTED: You have called {tool_name} with identical arguments multiple times. Please try a DIFFERENT approach or check if the goal is already met."
+                current_prompt = f"LOOP DETECTED: You have called {last_tool_name} with identical arguments multiple times. Please try a DIFFERENT approach or check if the goal is already met."
             else:
-                current_prompt = tracker.get_reflection_prompt(result)
+                current_prompt = tracker.get_reflection_prompt(last_tool_result)
             
             iteration += 1
         
@@ -7,9 +7,106 @@ import base64
 import numpy as np
 from typing import Tuple, List, Dict, Any
 
+# Numba is optional - without it the reference orbit falls back to pure mpmath
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    njit = None
+    prange = range
+    HAS_NUMBA = False
+
 # Set mpmath precision high enough for deep zooms
+# (mpmath uses GMP via gmpy2 automatically when installed - see mpmath.libmp.BACKEND)
 mpmath.mp.dps = 200  # 200 decimal digits for high precision reference orbit
 
+# Once |z| grows past this, the remaining orbit is handed off to the double precision kernel
+HANDOFF_MAGNITUDE = 1e-100
+
+
+def _iterate_orbit_f64(z_re, z_im, cref_re, cref_im, out_re, out_im, out_cre, out_cim, start, n_iter, bailout):
+    """
+    Double precision tail of the reference orbit: z -> z^2 + c.
+    Writes Z_n and the 2*Z_n coefficient from index `start` on and returns the point count.
+    """
+    bailout_sq = bailout * bailout
+    n = start
+    for _ in range(n_iter):
+        z_re, z_im = z_re * z_re - z_im * z_im + cref_re, 2.0 * z_re * z_im + cref_im
+        out_re[n] = z_re
+        out_im[n] = z_im
+        out_cre[n - 1] = 2.0 * z_re
+        out_cim[n - 1] = 2.0 * z_im
+        n += 1
+        if z_re * z_re + z_im * z_im > bailout_sq:
+            break
+    return n
+
+
+if HAS_NUMBA:
+    # Explicit signature so the kernel is compiled (and cached) at import, not on first rebase
+    _iterate_orbit_f64 = njit(
+        "i8(f8, f8, f8, f8, f4[:], f4[:], f4[:], f4[:], i8, i8, f8)",
+        cache=True, fastmath=True, boundscheck=False
+    )(_iterate_orbit_f64)
+
+
+def _escape_counts_f64(c_re, c_im, max_iter, bailout_sq, out):
+    """Escape-time kernel over independent points; out[k] = max_iter when c never escapes."""
+    for k in prange(c_re.shape[0]):
+        cr = c_re[k]
+        ci = c_im[k]
+        z_re = 0.0
+        z_im = 0.0
+        count = max_iter
+        for i in range(max_iter):
+            z_re, z_im = z_re * z_re - z_im * z_im + cr, 2.0 * z_re * z_im + ci
+            if z_re * z_re + z_im * z_im > bailout_sq:
+                count = i
+                break
+        out[k] = count
+
+
+if HAS_NUMBA:
+    _escape_counts_f64 = njit(
+        "void(f8[:], f8[:], i8, f8, u4[:])",
+        parallel=True, cache=True, fastmath=True, boundscheck=False
+    )(_escape_counts_f64)
+
+
+def _escape_counts_numpy(c_re, c_im, max_iter, bailout_sq, out):
+    """Vectorized fallback: iterate every still-bounded point at once."""
+    c = c_re + 1j * c_im
+    z = np.zeros_like(c)
+    active = np.arange(c.size)
+    out[:] = max_iter
+    for i in range(max_iter):
+        z[active] = z[active] * z[active] + c[active]
+        zs = z[active]
+        escaped = zs.real * zs.real + zs.imag * zs.imag > bailout_sq
+        out[active[escaped]] = i
+        active = active[~escaped]
+        if not active.size:
+            break
+
+
+def escape_counts(c_re, c_im, max_iter: int = 1000, bailout: float = 2.0) -> np.ndarray:
+    """
+    Double precision escape iteration for each point c (same convention as
+    JuliaGPU.sweep: max_iter means no escape). Returns uint32 in the input's shape.
+    Runs the parallel Numba kernel when available, otherwise NumPy.
+    """
+    c_re, c_im = np.broadcast_arrays(np.asarray(c_re, dtype=np.float64), np.asarray(c_im, dtype=np.float64))
+    shape = c_re.shape
+    # Broadcast results are read-only views (even when no broadcasting happened), which
+    # the kernel's f8[:] signature rejects - always hand it fresh contiguous copies
+    flat_re = np.array(c_re, dtype=np.float64, copy=True).ravel()
+    flat_im = np.array(c_im, dtype=np.float64, copy=True).ravel()
+    out = np.empty(flat_re.size, dtype=np.uint32)
+    kernel = _escape_counts_f64 if HAS_NUMBA else _escape_counts_numpy
+    kernel(flat_re, flat_im, int(max_iter), float(bailout) ** 2, out)
+    return out.reshape(shape)
+
 
 class FractalEngine:
     def __init__(self, width: int = 1920, height: int = 1080):
@@ -49,6 +146,9 @@ class FractalEngine:
         """
         if max_iter:
             self.max_iter = max_iter
+        
+        if HAS_NUMBA:
+            return self._calculate_reference_fast()
             
         c_ref = mpmath.mpc(self.cx, self.cy)
         
@@ -56,15 +156,17 @@ class FractalEngine:
         z = mpmath.mpc(0, 0)
         dc = mpmath.mpc(1, 0) # Derivative initializer (Automatic Differentiation)
         
-        # Use lists for storage
-        orbit_real = []
-        orbit_imag = []
-        deriv_real = []
-        deriv_imag = []
+        # Preallocated float32 storage, sized for the full orbit
+        size = self.max_iter + 1
+        orbit_real = np.empty(size, dtype=np.float32)
+        orbit_imag = np.empty(size, dtype=np.float32)
+        deriv_real = np.empty(size, dtype=np.float32)
+        deriv_imag = np.empty(size, dtype=np.float32)
         
         # First point
-        orbit_real.append(float(z.real))
-        orbit_imag.append(float(z.imag))
+        orbit_real[0] = float(z.real)
+        orbit_imag[0] = float(z.imag)
+        count = 1
         # Initial derivative for z_0 is 0, but for perturbation we track dz/dc
         # z_{n+1} = z_n^2 + c
         # dz_{n+1}/dc = 2*z_n * dz_n/dc + 1
@@ -73,6 +175,7 @@ class FractalEngine:
         # Dual number tracking:
         # We track dz_n (relative to dc).
         dz = mpmath.mpc(0, 0)
+        bailout_sq = mpmath.mpf(self.bailout) ** 2
         
         for i in range(self.max_iter):
             # 1. Update Derivative (Chain Rule first while z is z_n)
@@ -92,8 +195,9 @@ class FractalEngine:
             # No, K.I. Martin says Z_n is downcast to double. 
             # The precision comes from keeping delta small.
             
-            orbit_real.append(float(z.real))
-            orbit_imag.append(float(z.imag))
+            orbit_real[count] = float(z.real)
+            orbit_imag[count] = float(z.imag)
+            count += 1
             
             # For the universal formula delta_{n+1} = A_n * delta_n + B_n * delta_n^2 + dc
             # approximated as delta_{n+1} = 2*Z_n*delta_n + ... for Mandelbrot
@@ -125,24 +229,76 @@ class FractalEngine:
             # This allows the shader to just do: delta = Coeff * delta + delta^2 + dc
             
             coeff = 2*z # Simple derivative for Mandelbrot
-            deriv_real.append(float(coeff.real))
-            deriv_imag.append(float(coeff.imag))
+            deriv_real[i] = float(coeff.real)
+            deriv_imag[i] = float(coeff.imag)
             
-            if mpmath.norm(z) > self.bailout:
+            # Squared modulus against bailout^2 - no sqrt per iteration
+            if z.real * z.real + z.imag * z.imag > bailout_sq:
                 break
                 
-        # Pack into numpy arrays for efficient transfer
         # float32 is usually enough for the reference 'skeleton' effectively
         # but float64 (double) is safer for the "low precision" part if we want 
         # to zoom to 1e-1000 without intermediate rebasing too often.
         
-        np_orbit_re = np.array(orbit_real, dtype=np.float32)
-        np_orbit_im = np.array(orbit_imag, dtype=np.float32)
+        # Return views trimmed to the computed length (no copy)
+        return {
+            "orbit_re": orbit_real[:count],
+            "orbit_im": orbit_imag[:count],
+            "count": count
+        }
+
+    def _calculate_reference_fast(self) -> Dict[str, Any]:
+        """
+        Reference orbit with a high precision skeleton and a compiled double precision tail.
+        mpmath only runs until |z| leaves the neighbourhood of zero, then the Numba kernel
+        fills the rest of the preallocated float32 arrays.
+        """
+        c_ref = mpmath.mpc(self.cx, self.cy)
+        
+        size = self.max_iter + 1
+        orbit_re = np.empty(size, dtype=np.float32)
+        orbit_im = np.empty(size, dtype=np.float32)
+        deriv_re = np.empty(size, dtype=np.float32)
+        deriv_im = np.empty(size, dtype=np.float32)
+        
+        z = mpmath.mpc(0, 0)
+        orbit_re[0] = 0.0
+        orbit_im[0] = 0.0
+        count = 1
+        
+        # High precision skeleton (magnitudes compared squared to skip the sqrt)
+        bailout_sq = mpmath.mpf(self.bailout) ** 2
+        handoff_sq = mpmath.mpf(HANDOFF_MAGNITUDE) ** 2
+        escaped = False
+        i = 0
+        while i < self.max_iter:
+            z = z * z + c_ref
+            orbit_re[count] = float(z.real)
+            orbit_im[count] = float(z.imag)
+            coeff = 2*z
+            deriv_re[i] = float(coeff.real)
+            deriv_im[i] = float(coeff.imag)
+            count += 1
+            i += 1
+            mag_sq = z.real * z.real + z.imag * z.imag
+            if mag_sq > bailout_sq:
+                escaped = True
+                break
+            if mag_sq > handoff_sq:
+                break
+        
+        # Double precision tail
+        if not escaped and i < self.max_iter:
+            count = _iterate_orbit_f64(
+                float(z.real), float(z.imag), float(c_ref.real), float(c_ref.imag),
+                orbit_re, orbit_im, deriv_re, deriv_im,
+                count, self.max_iter - i, float(self.bailout)
+            )
         
         return {
-            "orbit_re": np_orbit_re,
-            "orbit_im": np_orbit_im,
-            "count": len(orbit_real)
+            "orbit_re": orbit_re[:count],
+            "orbit_im": orbit_im[:count],
+            "count": count
         }
 
     def get_orbit_as_bytes(self):
@@ -150,10 +306,10 @@ class FractalEngine:
         data = self.calculate_reference()
         
         # We need to serialize this to pass to JS/Shader
-        # Simplest way: base64 encoded raw bytes
-        import base64
-        re_bytes = base64.b64encode(data['orbit_re'].tobytes()).decode('utf-8')
-        im_bytes = base64.b64encode(data['orbit_im'].tobytes()).decode('utf-8')
+        # Simplest way: base64 encoded raw bytes, read straight from the
+        # (contiguous) array buffers instead of copying them via tobytes()
+        re_bytes = base64.b64encode(memoryview(data['orbit_re'])).decode('ascii')
+        im_bytes = base64.b64encode(memoryview(data['orbit_im'])).decode('ascii')
         
         return {
             "re": re_bytes, 
@@ -163,6 +319,7 @@ class FractalEngine:
 
 if __name__ == "__main__":
     # Test
+    print(f"mpmath backend: {mpmath.libmp.BACKEND}, numba: {HAS_NUMBA}")
     engine = FractalEngine()
     engine.set_view("-0.75", "0.0", "1.0")
     res = engine.get_orbit_as_bytes()
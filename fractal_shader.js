@@ -121,7 +121,13 @@ function initGL() {
     Object.assign(canvas.style, { position: 'fixed', top: '0', left: '0', width: '100vw', height: '100vh', zIndex: '-1', pointerEvents: 'none' });
     document.body.appendChild(canvas);
 
-    const gl = canvas.getContext('webgl2');
+    // Ask for the discrete GPU on dual-GPU machines; no MSAA needed for a full-screen quad
+    const gl = canvas.getContext('webgl2', {
+        powerPreference: 'high-performance',
+        antialias: false,
+        preserveDrawingBuffer: false,
+        desynchronized: true
+    });
     if (!gl) return;
 
     function createShader(gl, type, source) {
@@ -212,9 +218,27 @@ function initGL() {
         gl.uniform1f(locRotation, currentRotation);
 
         gl.drawArrays(gl.TRIANGLES, 0, 6);
-        requestAnimationFrame(render);
+        if (!fractalMotionPaused()) requestAnimationFrame(render);
     }
+    if (fractalMotionPaused()) window.addEventListener('resize', () => requestAnimationFrame(render));
     requestAnimationFrame(render);
 }
 
-if (document.readyState === 'complete') initGL(); else window.addEventListener('load', initGL);
+// The page CSS sets --fractal-motion: paused under prefers-reduced-motion - draw one static frame then
+function fractalMotionPaused() {
+    return getComputedStyle(document.documentElement).getPropertyValue('--fractal-motion').trim() === 'paused';
+}
+
+// Prefer the WebGPU compute path (fractal_shader_wgpu.js) when it is loaded and usable
+function startFractal() {
+    if (navigator.gpu && typeof initWebGPU === 'function') {
+        initWebGPU().then(ok => { if (!ok) initGL(); }).catch(err => {
+            console.warn('WebGPU fractal unavailable, using WebGL:', err);
+            initGL();
+        });
+    } else {
+        initGL();
+    }
+}
+
+if (document.readyState === 'complete') startFractal(); else window.addEventListener('load', startFractal);
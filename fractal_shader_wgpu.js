@@ -0,0 +1,258 @@
+/**
+ * WebGPU Fractal Background - compute shader path for the Infinite Spiral Zoom.
+ * Same fractal as fractal_shader.js, but each frame is a compute dispatch into a storage
+ * texture plus one blit, with per-frame state written to a single uniform buffer.
+ * initWebGPU() resolves to false when WebGPU is unusable so the caller can fall back to WebGL.
+ */
+
+const computeShaderSource = `
+    struct Params {
+        resolution: vec2f,
+        center: vec2f,
+        time: f32,
+        zoom: f32,
+        rotation: f32,
+        _pad: f32,
+    };
+
+    @group(0) @binding(0) var<uniform> params: Params;
+    @group(0) @binding(1) var outTex: texture_storage_2d<rgba8unorm, write>;
+
+    fn palette(t: f32) -> vec3f {
+        let a = vec3f(0.02, 0.01, 0.08);
+        let b = vec3f(0.15, 0.8, 1.0);
+        let c = vec3f(1.0, 1.0, 1.0);
+        let d = vec3f(0.6, 0.4, 0.5);
+        return a + b * cos(6.28318 * (c * t + d));
+    }
+
+    @compute @workgroup_size(8, 8)
+    fn main(@builtin(global_invocation_id) id: vec3u) {
+        let size = textureDimensions(outTex);
+        if (id.x >= size.x || id.y >= size.y) {
+            return;
+        }
+
+        // Match gl_FragCoord (bottom-left origin); storage texture rows run top-down
+        let fragCoord = vec2f(f32(id.x) + 0.5, params.resolution.y - f32(id.y) - 0.5);
+        var uv = (fragCoord * 2.0 - params.resolution) / params.resolution.y;
+
+        // Apply rotation for spiral effect
+        let cs = cos(params.rotation);
+        let sn = sin(params.rotation);
+        uv = vec2f(uv.x * cs - uv.y * sn, uv.x * sn + uv.y * cs);
+
+        // Scale by zoom
+        uv = uv / params.zoom;
+
+        let c = params.center + uv;
+        var z = c;
+        var iter = 0.0;
+        let maxIter = min(200.0 + 50.0 * log(params.zoom + 1.0), 800.0);
+        var smoothIter = 0.0;
+
+        for (var i = 0.0; i < 800.0; i += 1.0) {
+            if (i >= maxIter) {
+                break;
+            }
+
+            // z = z^2 + c (Mandelbrot iteration)
+            let x2 = z.x * z.x;
+            let y2 = z.y * z.y;
+            let xy = z.x * z.y;
+
+            if (x2 + y2 > 256.0) {
+                // Smooth coloring
+                let log_zn = log(x2 + y2) / 2.0;
+                let nu = log(log_zn / log(2.0)) / log(2.0);
+                smoothIter = i + 1.0 - nu;
+                break;
+            }
+
+            z = vec2f(x2 - y2 + c.x, 2.0 * xy + c.y);
+            iter = i;
+        }
+
+        var col: vec3f;
+        if (smoothIter > 0.0) {
+            // Outside the set - colorful
+            col = palette(smoothIter * 0.015 + params.time * 0.01);
+            // Add glow near boundary
+            let glow = 1.0 / (smoothIter * 0.02 + 0.5);
+            col += vec3f(0.2, 0.05, 0.4) * glow;
+        } else {
+            // Inside the set - dark with subtle variation
+            let inner = iter / maxIter;
+            col = vec3f(0.02, 0.01, 0.05) + vec3f(0.02, 0.03, 0.08) * inner;
+        }
+
+        textureStore(outTex, vec2i(id.xy), vec4f(clamp(col, vec3f(0.0), vec3f(1.0)), 1.0));
+    }
+`;
+
+// Full-screen triangle that copies the storage texture to the canvas
+const blitShaderSource = `
+    @group(0) @binding(0) var srcTex: texture_2d<f32>;
+
+    @vertex
+    fn vs(@builtin(vertex_index) i: u32) -> @builtin(position) vec4f {
+        var pos = array<vec2f, 3>(vec2f(-1.0, -1.0), vec2f(3.0, -1.0), vec2f(-1.0, 3.0));
+        return vec4f(pos[i], 0.0, 1.0);
+    }
+
+    @fragment
+    fn fs(@builtin(position) pos: vec4f) -> @location(0) vec4f {
+        return textureLoad(srcTex, vec2i(pos.xy), 0);
+    }
+`;
+
+async function initWebGPU() {
+    if (!navigator.gpu) return false;
+
+    const adapter = await navigator.gpu.requestAdapter({ powerPreference: 'high-performance' });
+    if (!adapter) return false;
+    const device = await adapter.requestDevice();
+
+    const canvas = document.createElement('canvas');
+    canvas.id = 'fractal-canvas';
+    Object.assign(canvas.style, { position: 'fixed', top: '0', left: '0', width: '100vw', height: '100vh', zIndex: '-1', pointerEvents: 'none' });
+    document.body.appendChild(canvas);
+
+    // Anything below can throw (configure, pipeline creation...) - never leave a dead canvas behind
+    try {
+        const context = canvas.getContext('webgpu');
+        if (!context) {
+            canvas.remove();
+            device.destroy();
+            return false;
+        }
+        const format = navigator.gpu.getPreferredCanvasFormat();
+        context.configure({ device, format, alphaMode: 'opaque' });
+
+        // Shader compile / pipeline errors are reported asynchronously - catch them here
+        device.pushErrorScope('validation');
+        const computePipeline = device.createComputePipeline({
+            layout: 'auto',
+            compute: { module: device.createShaderModule({ code: computeShaderSource }), entryPoint: 'main' }
+        });
+        const blitModule = device.createShaderModule({ code: blitShaderSource });
+        const blitPipeline = device.createRenderPipeline({
+            layout: 'auto',
+            vertex: { module: blitModule, entryPoint: 'vs' },
+            fragment: { module: blitModule, entryPoint: 'fs', targets: [{ format }] },
+            primitive: { topology: 'triangle-list' }
+        });
+        const pipelineError = await device.popErrorScope();
+        if (pipelineError) {
+            console.error(pipelineError.message);
+            canvas.remove();
+            device.destroy();
+            return false;
+        }
+
+        // Params struct: resolution, center, time, zoom, rotation, pad (8 floats)
+        const params = new Float32Array(8);
+        const uniformBuffer = device.createBuffer({
+            size: params.byteLength,
+            usage: GPUBufferUsage.UNIFORM | GPUBufferUsage.COPY_DST
+        });
+
+        let storageTex = null;
+        let computeBindGroup = null;
+        let blitBindGroup = null;
+
+        function resize() {
+            const dpr = window.devicePixelRatio || 1;
+            const width = Math.max(1, Math.floor(canvas.clientWidth * dpr));
+            const height = Math.max(1, Math.floor(canvas.clientHeight * dpr));
+            if (storageTex && canvas.width === width && canvas.height === height) return;
+
+            canvas.width = width;
+            canvas.height = height;
+            if (storageTex) storageTex.destroy();
+            storageTex = device.createTexture({
+                size: [width, height],
+                format: 'rgba8unorm',
+                usage: GPUTextureUsage.STORAGE_BINDING | GPUTextureUsage.TEXTURE_BINDING
+            });
+            const view = storageTex.createView();
+            computeBindGroup = device.createBindGroup({
+                layout: computePipeline.getBindGroupLayout(0),
+                entries: [
+                    { binding: 0, resource: { buffer: uniformBuffer } },
+                    { binding: 1, resource: view }
+                ]
+            });
+            blitBindGroup = device.createBindGroup({
+                layout: blitPipeline.getBindGroupLayout(0),
+                entries: [{ binding: 0, resource: view }]
+            });
+        }
+
+        const startTime = Date.now();
+
+        // ========== INFINITE SPIRAL ZOOM CONFIGURATION (same as fractal_shader.js) ==========
+        const TARGET_X = -0.743643887037158704752191506114774;
+        const TARGET_Y = 0.131825904205311970493132056385139;
+        const ROTATION_PER_ZOOM = 0.1;
+        const ZOOM_SPEED = 0.5;
+        const MAX_ZOOM_LOG = 35;
+
+        let currentZoomLog = 0;
+        let currentRotation = 0;
+
+        function render() {
+            const time = (Date.now() - startTime) * 0.001;
+            resize();
+
+            // Continuous zoom with synchronized spiral rotation, looping at max zoom
+            currentZoomLog += ZOOM_SPEED * 0.016;
+            currentRotation += ROTATION_PER_ZOOM * ZOOM_SPEED * 0.016;
+            if (currentZoomLog > MAX_ZOOM_LOG) {
+                currentZoomLog = 0;
+                currentRotation = currentRotation % (2.0 * Math.PI);
+            }
+
+            params[0] = canvas.width;
+            params[1] = canvas.height;
+            params[2] = TARGET_X;
+            params[3] = TARGET_Y;
+            params[4] = time;
+            params[5] = Math.exp(currentZoomLog);
+            params[6] = currentRotation;
+            device.queue.writeBuffer(uniformBuffer, 0, params);
+
+            const encoder = device.createCommandEncoder();
+
+            const computePass = encoder.beginComputePass();
+            computePass.setPipeline(computePipeline);
+            computePass.setBindGroup(0, computeBindGroup);
+            computePass.dispatchWorkgroups(Math.ceil(canvas.width / 8), Math.ceil(canvas.height / 8));
+            computePass.end();
+
+            const renderPass = encoder.beginRenderPass({
+                colorAttachments: [{
+                    view: context.getCurrentTexture().createView(),
+                    clearValue: { r: 0, g: 0, b: 0, a: 1 },
+                    loadOp: 'clear',
+                    storeOp: 'store'
+                }]
+            });
+            renderPass.setPipeline(blitPipeline);
+            renderPass.setBindGroup(0, blitBindGroup);
+            renderPass.draw(3);
+            renderPass.end();
+
+            device.queue.submit([encoder.finish()]);
+            if (!fractalMotionPaused()) requestAnimationFrame(render);
+        }
+        if (fractalMotionPaused()) window.addEventListener('resize', () => requestAnimationFrame(render));
+        requestAnimationFrame(render);
+        return true;
+    } catch (err) {
+        console.error(err);
+        canvas.remove();
+        device.destroy();
+        return false;
+    }
+}
@@ -1,7 +1,12 @@
+from __future__ import annotations
 
 import time
+from collections import deque
+from itertools import groupby
 from typing import List, Dict, Any, Optional
 
+__all__ = ["GoalTracker"]
+
 class GoalTracker:
     """
     Manages the state and progress of the agent towards a defined goal.
@@ -15,8 +20,8 @@ class GoalTracker:
         self.completed_steps: List[str] = []
         
         # Heuristics for loop detection
-        self.last_actions: List[str] = []
         self.max_action_history = 5
+        self.last_actions = deque(maxlen=self.max_action_history)
         
     def add_action(self, tool_name: str, args: Dict[str, Any], result: str):
         """Record an action and its result."""
@@ -27,36 +32,44 @@ class GoalTracker:
             "result": result[:500] # Cap size
         })
         
-        self.last_actions.append(action_summary)
-        if len(self.last_actions) > self.max_action_history:
-            self.last_actions.pop(0)
+        # Order-independent key: same tool + same arguments compare equal
+        if isinstance(args, dict):
+            arg_key = tuple(sorted((k, repr(v)) for k, v in args.items()))
+        else:
+            arg_key = repr(args)
+        self.last_actions.append((tool_name, arg_key))
             
     def check_for_loop(self) -> bool:
         """Detect if the agent is stuck in a repetitive loop."""
-        if len(self.last_actions) < self.max_action_history:
-            return False
-        
-        # Check if most recent actions are identical
-        if all(a == self.last_actions[0] for a in self.last_actions):
-            return True
-        return False
+        # Full window of identical recent actions
+        return len(self.last_actions) == self.max_action_history and len(set(self.last_actions)) == 1
 
     def get_progress_summary(self) -> str:
         """Generate a summary of what has been accomplished so far."""
         if not self.history:
             return "No actions taken yet."
         
-        steps = [f"- {h['action']} -> Result: {h['result'][:100]}..." for h in self.history]
+        # Last few actions only, with identical consecutive calls collapsed to "xN"
+        recent = self.history[-self.max_action_history:]
+        steps = []
+        for action, group in groupby(recent, key=lambda h: h['action']):
+            group = list(group)
+            repeat = f" x{len(group)}" if len(group) > 1 else ""
+            steps.append(f"- {action}{repeat} -> Result: {group[-1]['result'][:80]}...")
+        if len(self.history) > len(recent):
+            steps.insert(0, f"({len(self.history) - len(recent)} earlier actions omitted)")
         return "\n".join(steps)
 
     def get_reflection_prompt(self, last_result: str) -> str:
         """Create a prompt for the agent to reflect on its progress."""
-        prompt = f"""TOOL RESULT: {last_result[:2000]}
-
-GOAL: {self.goal}
+        # Stable goal + instructions first, the changing tool result last,
+        # so consecutive reflection prompts share the longest possible prefix
+        prompt = f"""GOAL: {self.goal}
 
 Is the goal complete? 
 - If YES: Write your final answer now.
 - If NO: Call the next tool immediately.
+
+TOOL RESULT: {last_result[:2000]}
 """
         return prompt
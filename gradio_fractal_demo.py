@@ -1,5 +1,13 @@
-import gradio as gr
 import os
+from functools import lru_cache
+
+# rjsmin is optional - without it the JS is shipped unminified
+try:
+    import rjsmin
+    HAS_RJSMIN = True
+except ImportError:
+    rjsmin = None
+    HAS_RJSMIN = False
 
 # Custom CSS for glassmorphism and to ensure Gradio background is transparent
 custom_css = """
@@ -18,13 +26,36 @@ gradio-app {
 /* Glassmorphism effect for blocks */
 .prose, .form, .gr-box, .gr-panel, .gr-button {
     background: rgba(255, 255, 255, 0.05) !important;
-    backdrop-filter: blur(10px) !important;
-    -webkit-backdrop-filter: blur(10px) !important;
     border: 1px solid rgba(255, 255, 255, 0.1) !important;
     border-radius: 12px !important;
     color: #e0e0e0 !important;
 }
 
+/* Blur only the containers, each on its own compositor layer so the
+   animated fractal underneath doesn't force a repaint of the block */
+.prose, .form, .gr-box, .gr-panel {
+    backdrop-filter: blur(8px) saturate(1.1) !important;
+    -webkit-backdrop-filter: blur(8px) saturate(1.1) !important;
+    will-change: backdrop-filter, transform;
+    transform: translateZ(0);
+    contain: paint;
+}
+
+/* Read by fractal_shader.js - "paused" renders a single static frame */
+:root {
+    --fractal-motion: running;
+}
+
+@media (prefers-reduced-motion: reduce) {
+    :root {
+        --fractal-motion: paused;
+    }
+
+    .gr-button {
+        transition: none !important;
+    }
+}
+
 /* Specific styling for clarity */
 h1, h2, h3, p, label, .output-text {
     color: #ffffff !important;
@@ -49,39 +80,58 @@ input, textarea {
 }
 """
 
-def process_text(text):
-    return f"Processed: {text}"
+def process_text(texts):
+    """Batched handler: Gradio passes up to max_batch_size queued inputs as one list."""
+    return [[f"Processed: {text}" for text in texts]]
 
-# Path to the JS file
+# Path to the JS files - the WebGPU path is loaded first so fractal_shader.js can prefer it
 js_path = os.path.join(os.path.dirname(__file__), "fractal_shader.js")
+wgpu_js_path = os.path.join(os.path.dirname(__file__), "fractal_shader_wgpu.js")
+
 
-with open(js_path, "r") as f:
-    js_code = f.read()
+@lru_cache(maxsize=1)
+def _load_js() -> str:
+    """Read and minify the fractal scripts once per process (template-literal shaders are kept verbatim)."""
+    parts = []
+    for path in (wgpu_js_path, js_path):
+        with open(path, "r") as f:
+            parts.append(f.read())
+    src = "\n".join(parts)
+    return rjsmin.jsmin(src) if HAS_RJSMIN else src
 
-with gr.Blocks() as demo:
-    gr.Markdown("# 🌌 Fractal Background Demo")
-    gr.Markdown("This UI features a high-performance WebGL fractal background and glassmorphism styling.")
+
+def create_demo():
+    """Build the demo app. Gradio is imported here so importing this module stays cheap."""
+    import gradio as gr
+    
+    with gr.Blocks() as demo:
+        gr.Markdown("# 🌌 Fractal Background Demo")
+        gr.Markdown("This UI features a high-performance WebGL fractal background and glassmorphism styling.")
     
-    with gr.Row():
-        input_text = gr.Textbox(label="Enter some text", placeholder="Type here...")
-        output_text = gr.Textbox(label="Result")
+        with gr.Row():
+            input_text = gr.Textbox(label="Enter some text", placeholder="Type here...")
+            output_text = gr.Textbox(label="Result")
     
-    btn = gr.Button("Generate")
-    btn.click(process_text, inputs=input_text, outputs=output_text)
+        btn = gr.Button("Generate")
+        btn.click(process_text, inputs=input_text, outputs=output_text, batch=True, max_batch_size=8)
     
-    with gr.Accordion("How it works", open=False):
-        gr.Markdown("""
-        ### The Math
-        This is a **Julia Set**, defined by the formula $z_{n+1} = z_n^2 + c$.
+        with gr.Accordion("How it works", open=False):
+            gr.Markdown("""
+            ### The Math
+            This is a **Julia Set**, defined by the formula $z_{n+1} = z_n^2 + c$.
         
-        ### The Animation
-        The complex constant $c$ is animated over time, causing the fractal shape to morph and evolve continuously.
+            ### The Animation
+            The complex constant $c$ is animated over time, causing the fractal shape to morph and evolve continuously.
         
-        ### The Tech
-        - **WebGL/GLSL**: The animation runs directly on your GPU for maximum performance.
-        - **Gradio**: Standard Gradio components are styled with `backdrop-filter: blur()` to create the glass effect.
-        """)
+            ### The Tech
+            - **WebGL/GLSL**: The animation runs directly on your GPU for maximum performance.
+            - **Gradio**: Standard Gradio components are styled with `backdrop-filter: blur()` to create the glass effect.
+            """)
+    
+    # Several sessions can be in flight at once; further requests wait in a bounded queue
+    demo.queue(default_concurrency_limit=4, max_size=32)
+    return demo
 
 if __name__ == "__main__":
     # Pass js and css here as per Gradio warning/updates
-    demo.launch(js=js_code, css=custom_css)
+    create_demo().launch(js=_load_js(), css=custom_css)
@@ -0,0 +1,158 @@
+"""
+Julia GPU - Escape-time sweeps over the c-plane on an offscreen OpenGL context.
+"""
+import mpmath
+import numpy as np
+from typing import Tuple
+
+# moderngl is optional - only needed for GPU sweeps
+try:
+    import moderngl
+    HAS_MODERNGL = True
+except ImportError:
+    moderngl = None
+    HAS_MODERNGL = False
+
+
+VERTEX_SHADER = """
+#version 330
+in vec2 in_pos;
+void main() {
+    gl_Position = vec4(in_pos, 0.0, 1.0);
+}
+"""
+
+# Same DS (float-float, ~48-bit mantissa) helpers as fractal_shader.js
+FRAGMENT_SHADER = """
+#version 330
+uniform vec2 u_resolution;
+uniform vec2 u_cx;        // Center real part (hi, lo)
+uniform vec2 u_cy;        // Center imag part (hi, lo)
+uniform float u_step;     // c-plane distance between neighbouring pixels
+uniform int u_maxIter;
+uniform float u_bailoutSq;
+out uint iterCount;
+
+vec2 ds_add(vec2 d1, vec2 d2) {
+    float s = d1.x + d2.x;
+    float t = (s - d1.x) - d2.x;
+    float e = (d1.x - (s - t)) + (d2.x - t);
+    float low = (d1.y + d2.y) + e;
+    float high = s + low;
+    return vec2(high, low + (s - high));
+}
+
+vec2 ds_sub(vec2 d1, vec2 d2) {
+    return ds_add(d1, vec2(-d2.x, -d2.y));
+}
+
+vec2 ds_mul(vec2 d1, vec2 d2) {
+    const float split = 4097.0;
+    float c1 = d1.x * split;
+    float h1 = c1 - (c1 - d1.x);
+    float l1 = d1.x - h1;
+    float c2 = d2.x * split;
+    float h2 = c2 - (c2 - d2.x);
+    float l2 = d2.x - h2;
+    float p = d1.x * d2.x;
+    float e = ((h1 * h2 - p) + h1 * l2 + l1 * h2) + l1 * l2;
+    float s = p + (e + d1.x * d2.y + d1.y * d2.x);
+    return vec2(s, (p - s) + (e + d1.x * d2.y + d1.y * d2.x));
+}
+
+void main() {
+    // Pixel offset from the sweep center (zero for a 1x1 sweep)
+    vec2 offset = (gl_FragCoord.xy - 0.5 * u_resolution) * u_step;
+    vec2 cr = ds_add(u_cx, vec2(offset.x, 0.0));
+    vec2 ci = ds_add(u_cy, vec2(offset.y, 0.0));
+
+    vec2 zr = vec2(0.0);
+    vec2 zi = vec2(0.0);
+    int i = 0;
+    for (; i < u_maxIter; i++) {
+        // z = z^2 + c
+        vec2 zri = ds_mul(zr, zi);
+        zr = ds_add(ds_sub(ds_mul(zr, zr), ds_mul(zi, zi)), cr);
+        zi = ds_add(ds_add(zri, zri), ci);
+        if (zr.x * zr.x + zi.x * zi.x > u_bailoutSq) break;
+    }
+    iterCount = uint(i);
+}
+"""
+
+
+def _split_f32(x) -> Tuple[float, float]:
+    """Split a high precision value into a float32 (hi, lo) pair."""
+    x = mpmath.mpf(x)
+    hi = float(np.float32(float(x)))
+    lo = float(np.float32(float(x - hi)))
+    return hi, lo
+
+
+class JuliaGPU:
+    """Renders escape iteration counts for a grid of c values around a center point."""
+
+    def __init__(self):
+        if not HAS_MODERNGL:
+            raise RuntimeError("moderngl is not installed")
+        try:
+            self.ctx = moderngl.create_standalone_context()
+        except Exception:
+            # Headless Linux: no X display, fall back to EGL
+            self.ctx = moderngl.create_standalone_context(backend="egl")
+
+        self.prog = self.ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        quad = np.array([-1.0, -1.0, 1.0, -1.0, -1.0, 1.0, 1.0, 1.0], dtype=np.float32)
+        self.vbo = self.ctx.buffer(quad.tobytes())
+        self.vao = self.ctx.vertex_array(self.prog, [(self.vbo, "2f", "in_pos")])
+        self._fbo = None
+        self._fbo_size = None
+
+    def _framebuffer(self, width: int, height: int):
+        """Reuse the R32UI target while the sweep size stays the same."""
+        if self._fbo_size != (width, height):
+            if self._fbo:
+                self._fbo.release()
+            texture = self.ctx.texture((width, height), 1, dtype="u4")
+            self._fbo = self.ctx.framebuffer(color_attachments=[texture])
+            self._fbo_size = (width, height)
+        return self._fbo
+
+    def sweep(self, cx, cy, width: int = 1, height: int = 1, step: float = 0.0,
+              max_iter: int = 1000, bailout: float = 2.0) -> np.ndarray:
+        """
+        Escape iteration per pixel as a (height, width) uint32 array; max_iter means no escape.
+        cx/cy may be decimal strings or mpf to keep their precision.
+        """
+        fbo = self._framebuffer(width, height)
+        fbo.use()
+        self.prog["u_resolution"].value = (float(width), float(height))
+        self.prog["u_cx"].value = _split_f32(cx)
+        self.prog["u_cy"].value = _split_f32(cy)
+        self.prog["u_step"].value = float(step)
+        self.prog["u_maxIter"].value = int(max_iter)
+        self.prog["u_bailoutSq"].value = float(bailout) ** 2
+        self.vao.render(moderngl.TRIANGLE_STRIP)
+
+        data = fbo.read(components=1, dtype="u4")
+        return np.frombuffer(data, dtype=np.uint32).reshape(height, width)
+
+    def release(self):
+        """Free GPU resources."""
+        if self._fbo:
+            self._fbo.release()
+        self.vao.release()
+        self.vbo.release()
+        self.prog.release()
+        self.ctx.release()
+
+
+if __name__ == "__main__":
+    # Test: coarse sweep over the main cardioid, then the Seahorse Valley point
+    gpu = JuliaGPU()
+    grid = gpu.sweep("-0.5", "0.0", width=64, height=32, step=3.0 / 64, max_iter=200)
+    print(f"Sweep: {int((grid == 200).sum())} of {grid.size} points did not escape")
+    count = gpu.sweep("-0.743643887037158704752191506114774", "0.131825904205311970493132056385139",
+                      max_iter=20000, bailout=1e10)
+    print(f"Seahorse point: {int(count[0, 0])} iterations")
+    gpu.release()
@@ -1,9 +1,16 @@
 """
 Ollama Client - Wrapper for Ollama API with tool-calling support.
 """
-import json
-import ollama
-from typing import Generator, Optional, Callable
+import re
+import time
+from functools import lru_cache
+from typing import AsyncGenerator, Generator, Optional, Callable
+
+# orjson is optional - fall back to the stdlib parser
+try:
+    from orjson import loads as _json_loads, JSONDecodeError as _JSONDecodeError
+except ImportError:
+    from json import loads as _json_loads, JSONDecodeError as _JSONDecodeError
 
 DEFAULT_MODEL = "nemotron-3-nano:latest"
 
@@ -27,147 +34,286 @@ Available Tools:
 
 DO NOT explain your reasoning. Just act: call a tool or give the answer."""
 
+# ```tool_call ... ``` block
+_TOOL_CALL_BLOCK = re.compile(r"```tool_call\s*\n?(.*?)\n?```", re.DOTALL)
+
+
+@lru_cache(maxsize=None)
+def _ollama():
+    """The ollama module, imported on first use (it pulls in httpx and pydantic)."""
+    import ollama
+    return ollama
+
 
 class OllamaClient:
     """Client for interacting with Ollama API."""
     
     def __init__(self, model: str = DEFAULT_MODEL):
         self.model = model
-        self.client = ollama.Client()
-        self.conversation_history = []
+        self.client = _ollama().Client()
         # Configurable parameters (can be modified via settings)
         self.system_prompt = SYSTEM_PROMPT
         self.temperature = 0.6
         self.num_predict = 2048
+        # Older turns are dropped past this many (user, assistant) pairs
+        self.max_history_turns = 20
+        # Sent to the model as-is: system message first, then the conversation
+        self._messages = [{"role": "system", "content": self.system_prompt}]
+    
+    @property
+    def conversation_history(self) -> list:
+        """Messages after the system prompt."""
+        return self._messages[1:]
     
     def reset_conversation(self):
         """Clear conversation history."""
-        self.conversation_history = []
+        del self._messages[1:]
+    
+    def _begin_turn(self, system_prompt: str, message: str):
+        """Point the system slot at system_prompt and append the pending user message."""
+        if self._messages[0]["content"] != system_prompt:
+            self._messages[0] = {"role": "system", "content": system_prompt}
+        self._messages.append({"role": "user", "content": message})
     
     def chat(self, message: str, system_prompt: str = None) -> str:
         """Send a message and get a response with retries for empty outputs."""
         # Use instance system_prompt if none provided
         effective_prompt = system_prompt if system_prompt is not None else self.system_prompt
-        messages = [{"role": "system", "content": effective_prompt}]
-        messages.extend(self.conversation_history)
-        messages.append({"role": "user", "content": message})
+        self._begin_turn(effective_prompt, message)
         
         max_retries = 2
-        assistant_message = ""
+        try:
+            assistant_message = self._chat_with_retries(max_retries)
+        finally:
+            # The pending user message is re-added together with the reply
+            self._messages.pop()
+        
+        # Update conversation history
+        self.add_exchange(message, assistant_message)
         
+        return assistant_message
+    
+    def _chat_with_retries(self, max_retries: int) -> str:
+        """Query the model with the pending messages, retrying on empty output."""
+        assistant_message = ""
         for attempt in range(max_retries + 1):
-            # Apply parameters (using instance variables for configurability)
-            options = {
-                "temperature": self.temperature,
-                "top_p": 0.95,
-                "num_predict": self.num_predict
-            }
-            
             response = self.client.chat(
                 model=self.model,
-                messages=messages,
-                options=options
+                messages=self._messages,
+                options=self._options()
             )
+            assistant_message = self._extract_message(response, attempt)
+            if assistant_message.strip():
+                break
             
-            # Extract content - Nemotron often puts everything in 'thinking'
-            raw_content = response["message"]["content"]
-            thinking_content = response["message"].get("thinking", "")
-            
-            # If content is empty but thinking exists, use thinking as raw content
-            # Wrap it in <think> tags so agent.py can parse it as a thought
-            if not raw_content.strip() and thinking_content.strip():
+            print(f"[DEBUG] Empty message on attempt {attempt+1}, retrying...")
+        
+        return assistant_message
+    
+    def _options(self) -> dict:
+        """Sampling options (using instance variables for configurability)."""
+        return {
+            "temperature": self.temperature,
+            "top_p": 0.95,
+            "num_predict": self.num_predict
+        }
+    
+    def _extract_message(self, response, attempt: int) -> str:
+        """Turn a chat response into the raw assistant message, folding in the 'thinking' field."""
+        # Extract content - Nemotron often puts everything in 'thinking'
+        raw_content = response["message"]["content"]
+        thinking_content = response["message"].get("thinking") or ""
+        
+        # Only merge when there is real thinking text (isspace avoids copying like strip() would)
+        if thinking_content and not thinking_content.isspace():
+            has_content = bool(raw_content) and not raw_content.isspace()
+            if not has_content:
+                # Content is empty - use thinking as raw content,
+                # wrapped in <think> tags so agent.py can parse it as a thought
                 if attempt == 0:
                     print(f"[DEBUG] Found content in 'thinking' field ({len(thinking_content)} chars)")
-                # If it doesn't already have tags, add them
                 if "<think>" not in thinking_content:
-                    raw_content = f"<think>{thinking_content}</think>"
+                    raw_content = "".join(("<think>", thinking_content, "</think>"))
                 else:
                     raw_content = thinking_content
-            elif raw_content.strip() and thinking_content.strip():
+            elif "<think>" not in thinking_content:
                 # Both have content? Prepend thinking
-                if "<think>" not in thinking_content:
-                    raw_content = f"<think>{thinking_content}</think>\n{raw_content}"
-                else:
-                    raw_content = f"{thinking_content}\n{raw_content}"
-            
-            # Diagnostic log to terminal
-            if attempt == 0 or len(raw_content) == 0:
-                print(f"[DEBUG] Attempt {attempt+1} - Raw Length: {len(raw_content)}")
-                if 0 < len(raw_content) < 200:
-                    print(f"[DEBUG] Raw: {repr(raw_content)}")
-            
-            # We now return the RAW content (including <think> and <tool_call> tags)
-            # The Agent class in agent.py handles the extraction and stripping for UI display.
-            assistant_message = raw_content
-            
-            # Legacy cleanup: only remove "done thinking" strings if they appear outside tags
-            if "...done thinking." in assistant_message:
-                assistant_message = assistant_message.replace("...done thinking.", "").strip()
-            
-            if assistant_message.strip():
-                break
-            
-            print(f"[DEBUG] Empty message on attempt {attempt+1}, retrying...")
+                raw_content = "".join(("<think>", thinking_content, "</think>\n", raw_content))
+            else:
+                raw_content = "".join((thinking_content, "\n", raw_content))
         
-        # Update conversation history
-        self.conversation_history.append({"role": "user", "content": message})
-        self.conversation_history.append({"role": "assistant", "content": assistant_message})
+        # Diagnostic log to terminal
+        if attempt == 0 or len(raw_content) == 0:
+            print(f"[DEBUG] Attempt {attempt+1} - Raw Length: {len(raw_content)}")
+            if 0 < len(raw_content) < 200:
+                print(f"[DEBUG] Raw: {repr(raw_content)}")
+        
+        # We now return the RAW content (including <think> and <tool_call> tags)
+        # The Agent class in agent.py handles the extraction and stripping for UI display.
+        assistant_message = raw_content
+        
+        # Legacy cleanup: only remove "done thinking" strings if they appear outside tags
+        if "...done thinking." in assistant_message:
+            assistant_message = assistant_message.replace("...done thinking.", "").strip()
         
         return assistant_message
     
     def chat_stream(self, message: str, system_prompt: str = SYSTEM_PROMPT) -> Generator[str, None, None]:
         """Send a message and stream the response."""
-        messages = [{"role": "system", "content": system_prompt}]
-        messages.extend(self.conversation_history)
-        messages.append({"role": "user", "content": message})
+        self._begin_turn(system_prompt, message)
         
-        full_response = ""
+        parts: list[str] = []
         
-        for chunk in self.client.chat(
-            model=self.model,
-            messages=messages,
-            stream=True
-        ):
-            content = chunk["message"]["content"]
-            full_response += content
-            yield content
+        try:
+            for chunk in self.client.chat(
+                model=self.model,
+                messages=self._messages,
+                stream=True
+            ):
+                content = chunk["message"]["content"]
+                parts.append(content)
+                yield content
+        finally:
+            self._messages.pop()
         
         # Update conversation history after streaming completes
-        self.conversation_history.append({"role": "user", "content": message})
-        self.conversation_history.append({"role": "assistant", "content": full_response})
+        self.add_exchange(message, "".join(parts))
+    
+    def chat_stream_accumulated(self, message: str, system_prompt: str = SYSTEM_PROMPT) -> Generator[str, None, None]:
+        """Like chat_stream, but each yield is the full response so far (what Gradio outputs expect)."""
+        parts: list[str] = []
+        for content in self.chat_stream(message, system_prompt):
+            parts.append(content)
+            yield "".join(parts)
+    
+    def add_exchange(self, message: str, response: str):
+        """Record a user message and the assistant's reply in the conversation."""
+        self._messages.append({"role": "user", "content": message})
+        self._messages.append({"role": "assistant", "content": response})
+        self._trim_history()
     
     def add_tool_result(self, tool_name: str, result: str):
         """Add a tool result to the conversation."""
-        self.conversation_history.append({
+        self._messages.append({
             "role": "user",
             "content": f"Tool `{tool_name}` returned:\n```\n{result}\n```\n\nContinue with the task."
         })
+        self._trim_history()
+    
+    def _trim_history(self):
+        """Keep the system message plus the last max_history_turns exchanges."""
+        excess = len(self._messages) - 1 - 2 * self.max_history_turns
+        if excess > 0:
+            del self._messages[1:1 + excess]
     
     def parse_tool_call(self, response: str) -> Optional[dict]:
         """Extract tool call from response if present."""
-        import re
+        if "```tool_call" not in response:
+            return None
         
-        # Look for ```tool_call ... ``` blocks
-        pattern = r"```tool_call\s*\n?(.*?)\n?```"
-        match = re.search(pattern, response, re.DOTALL)
+        match = _TOOL_CALL_BLOCK.search(response)
         
         if match:
             try:
-                return json.loads(match.group(1).strip())
-            except json.JSONDecodeError:
+                return _json_loads(match.group(1).strip())
+            except _JSONDecodeError:
                 return None
         
         return None
 
 
-def list_models() -> list[str]:
-    """List available Ollama models."""
-    client = ollama.Client()
-    models_response = client.list()
+
+class AsyncOllamaClient(OllamaClient):
+    """
+    OllamaClient on top of ollama.AsyncClient.
+    chat/chat_stream are coroutines, so several sessions (or tool work) can
+    overlap on one event loop instead of each pinning a thread during prefill.
+    """
+    
+    def __init__(self, model: str = DEFAULT_MODEL):
+        super().__init__(model)
+        self.client = _ollama().AsyncClient()
+    
+    async def chat(self, message: str, system_prompt: str = None) -> str:
+        """Send a message and get a response with retries for empty outputs."""
+        effective_prompt = system_prompt if system_prompt is not None else self.system_prompt
+        self._begin_turn(effective_prompt, message)
+        
+        max_retries = 2
+        assistant_message = ""
+        try:
+            for attempt in range(max_retries + 1):
+                response = await self.client.chat(
+                    model=self.model,
+                    messages=self._messages,
+                    options=self._options()
+                )
+                assistant_message = self._extract_message(response, attempt)
+                if assistant_message.strip():
+                    break
+                
+                print(f"[DEBUG] Empty message on attempt {attempt+1}, retrying...")
+        finally:
+            self._messages.pop()
+        
+        self.add_exchange(message, assistant_message)
+        return assistant_message
+    
+    async def chat_stream(self, message: str, system_prompt: str = SYSTEM_PROMPT) -> AsyncGenerator[str, None]:
+        """Send a message and stream the response."""
+        self._begin_turn(system_prompt, message)
+        
+        parts: list[str] = []
+        
+        try:
+            async for chunk in await self.client.chat(
+                model=self.model,
+                messages=self._messages,
+                stream=True
+            ):
+                content = chunk["message"]["content"]
+                parts.append(content)
+                yield content
+        finally:
+            self._messages.pop()
+        
+        self.add_exchange(message, "".join(parts))
+    
+    async def chat_stream_accumulated(self, message: str, system_prompt: str = SYSTEM_PROMPT) -> AsyncGenerator[str, None]:
+        """Like chat_stream, but each yield is the full response so far (what Gradio outputs expect)."""
+        parts: list[str] = []
+        async for content in self.chat_stream(message, system_prompt):
+            parts.append(content)
+            yield "".join(parts)
+
+
+# The model list only changes when a model is pulled, so reuse it for this long
+MODEL_LIST_TTL = 30  # seconds
+
+_shared_client = None
+
+
+def _get_shared_client():
+    """One HTTP session for the module-level helpers, created on first use."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = _ollama().Client()
+    return _shared_client
+
+
+@lru_cache(maxsize=1)
+def _list_models_at(bucket: int) -> tuple:
+    """Query the model list; bucket is the current TTL window, so a new window re-queries."""
+    models_response = _get_shared_client().list()
     # Handle both dict and object responses based on library version
     if hasattr(models_response, 'models'):
-        return [m.model for m in models_response.models]
-    return [m.get("model") or m.get("name") for m in models_response.get("models", [])]
+        return tuple(m.model for m in models_response.models)
+    return tuple(m.get("model") or m.get("name") for m in models_response.get("models", []))
+
+
+def list_models() -> list[str]:
+    """List available Ollama models (cached for MODEL_LIST_TTL seconds)."""
+    return list(_list_models_at(int(time.time() // MODEL_LIST_TTL)))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+import numpy as np
+from fractal_engine import HAS_NUMBA, escape_counts, _escape_counts_numpy
+
+MAX_ITER = 200
+BAILOUT = 2.0
+
+# Equal-shape 1-D, equal-shape 2-D (meshgrid) and broadcast (1,N) x (N,1) inputs
+xs = np.linspace(-2.0, 0.6, 200)
+ys = np.linspace(-1.2, 1.2, 150)
+grid_re, grid_im = np.meshgrid(xs, ys)
+CASES = [
+    ("1-D", np.zeros(4) - 0.5, np.zeros(4)),
+    ("1-D line", xs, np.full_like(xs, 0.1)),
+    ("2-D meshgrid", grid_re, grid_im),
+    ("broadcast", xs[None, :], ys[:, None]),
+]
+
+print(f"Kernel: {'Numba' if HAS_NUMBA else 'NumPy fallback'}")
+failed = False
+for name, c_re, c_im in CASES:
+    counts = escape_counts(c_re, c_im, MAX_ITER, BAILOUT)
+
+    # Reference straight from the NumPy fallback
+    re, im = np.broadcast_arrays(c_re, c_im)
+    expected = np.empty(re.size, dtype=np.uint32)
+    _escape_counts_numpy(re.ravel().copy(), im.ravel().copy(), MAX_ITER, BAILOUT ** 2, expected)
+    expected = expected.reshape(re.shape)
+
+    ok = counts.shape == expected.shape and counts.dtype == np.uint32 and np.array_equal(counts, expected)
+    failed |= not ok
+    print(f"{name}: shape {counts.shape} -> {'OK' if ok else 'MISMATCH'}")
+
+if failed:
+    raise SystemExit(1)
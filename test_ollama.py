@@ -0,0 +1,55 @@
+import argparse
+import time
+import ollama
+
+model = "nemotron-3-nano:latest"
+
+SYSTEM_PROMPT = "You are a helpful assistant."
+FILES_PROMPT = "Hello, list the files in the current directory."
+
+# (name, system prompt or None, user message, stream)
+SCENARIOS = [
+    ("minimal", None, "Hello", False),
+    ("with_system", SYSTEM_PROMPT, FILES_PROMPT, False),
+    ("without_system", None, FILES_PROMPT, False),
+    ("stream", None, "Hello", True),
+]
+
+parser = argparse.ArgumentParser(description="Smoke-test chat calls against a local Ollama model")
+parser.add_argument("--only", choices=[s[0] for s in SCENARIOS], help="run a single scenario")
+args = parser.parse_args()
+
+# One client (one keep-alive connection) for every scenario
+client = ollama.Client()
+
+# Load the model once up front so the scenarios below time generation, not the load
+start = time.perf_counter()
+client.chat(model=model, messages=[{"role": "user", "content": "warm"}], options={"num_predict": 1})
+print(f"Loaded {model} in {time.perf_counter() - start:.1f}s")
+
+for name, system_prompt, user, stream in SCENARIOS:
+    if args.only and name != args.only:
+        continue
+
+    messages = [{"role": "user", "content": user}]
+    if system_prompt:
+        messages.insert(0, {"role": "system", "content": system_prompt})
+
+    print(f"\nTesting {model} [{name}]...")
+    start = time.perf_counter()
+    if stream:
+        parts = []
+        first_token = None
+        for chunk in client.chat(model=model, messages=messages, stream=True):
+            content = chunk['message']['content']
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            print(f"Chunk: {repr(content)}")
+            parts.append(content)
+        print(f"\nFinal content: {repr(''.join(parts))}")
+        if first_token is not None:
+            print(f"First chunk after {first_token * 1000:.0f} ms")
+    else:
+        response = client.chat(model=model, messages=messages)
+        print(f"Response: {repr(response['message']['content'])}")
+    print(f"Took {time.perf_counter() - start:.2f}s")
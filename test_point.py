@@ -1,21 +1,188 @@
+import argparse
+import math
 import mpmath
+import numpy as np
+
+# Numba is optional - without it the double-double kernel runs as plain Python
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    njit = None
+    HAS_NUMBA = False
+
+parser = argparse.ArgumentParser(description="Escape test for a Misiurewicz point")
+parser.add_argument("--ref", action="store_true", help="use the mpmath reference path (precision escalates as needed)")
+parser.add_argument("--gpu", action="store_true", help="run the point through the GPU sweep (float-float, ~48 bits)")
+parser.add_argument("--sweep", type=int, metavar="N",
+                    help="escape-test an N x N grid of double precision perturbations around the point")
+args = parser.parse_args()
 
 # Test Misiurewicz point with VERY high precision
 mpmath.mp.dps = 200  # 200 decimal digits
 
 # Seahorse Valley Misiurewicz point
-c = mpmath.mpf("-0.743643887037158704752191506114774") + mpmath.mpf("0.131825904205311970493132056385139") * 1j
+CX = "-0.743643887037158704752191506114774"
+CY = "0.131825904205311970493132056385139"
+cx = mpmath.mpf(CX)
+cy = mpmath.mpf(CY)
+
+MAX_ITER = 20000
+BAILOUT = 1e10  # Very high bailout
+
+# Grid spacing for --sweep
+SWEEP_STEP = 1e-12
+
+# Reference path: start cheap, keep this many digits beyond those the orbit amplifies away
+REF_START_DPS = 32
+REF_GUARD_DIGITS = 20
+
+
+# ===== Double-double arithmetic (~32 digits as an unevaluated hi + lo pair of doubles) =====
+# No fastmath here: reassociation would cancel the error terms these rely on.
+
+def _two_sum(a, b):
+    s = a + b
+    bb = s - a
+    return s, (a - (s - bb)) + (b - bb)
+
+
+def _quick_two_sum(a, b):
+    s = a + b
+    return s, b - (s - a)
+
+
+def _split(a):
+    t = 134217729.0 * a  # 2^27 + 1 (Dekker split)
+    hi = t - (t - a)
+    return hi, a - hi
+
+
+def _two_prod(a, b):
+    p = a * b
+    a_hi, a_lo = _split(a)
+    b_hi, b_lo = _split(b)
+    return p, ((a_hi * b_hi - p) + a_hi * b_lo + a_lo * b_hi) + a_lo * b_lo
+
+
+def _dd_add(a_hi, a_lo, b_hi, b_lo):
+    s, e = _two_sum(a_hi, b_hi)
+    return _quick_two_sum(s, e + a_lo + b_lo)
+
+
+def _dd_mul(a_hi, a_lo, b_hi, b_lo):
+    p, e = _two_prod(a_hi, b_hi)
+    return _quick_two_sum(p, e + a_hi * b_lo + a_lo * b_hi)
+
+
+def iterate_julia_dd(cx_hi, cx_lo, cy_hi, cy_lo, n, bail, mags):
+    """Iterate z -> z^2 + c in double-double, storing |z| per step. Returns iterations run."""
+    zr_hi, zr_lo, zi_hi, zi_lo = 0.0, 0.0, 0.0, 0.0
+    for i in range(n):
+        rr_hi, rr_lo = _dd_mul(zr_hi, zr_lo, zr_hi, zr_lo)
+        ii_hi, ii_lo = _dd_mul(zi_hi, zi_lo, zi_hi, zi_lo)
+        ri_hi, ri_lo = _dd_mul(zr_hi, zr_lo, zi_hi, zi_lo)
+        # re = zr^2 - zi^2 + cx, im = 2*zr*zi + cy
+        re_hi, re_lo = _dd_add(rr_hi, rr_lo, -ii_hi, -ii_lo)
+        zr_hi, zr_lo = _dd_add(re_hi, re_lo, cx_hi, cx_lo)
+        zi_hi, zi_lo = _dd_add(2.0 * ri_hi, 2.0 * ri_lo, cy_hi, cy_lo)
+
+        mag = (zr_hi * zr_hi + zi_hi * zi_hi) ** 0.5
+        mags[i] = mag
+        if mag > bail:
+            return i + 1
+    return n
+
+
+if HAS_NUMBA:
+    _two_sum = njit(cache=True)(_two_sum)
+    _quick_two_sum = njit(cache=True)(_quick_two_sum)
+    _split = njit(cache=True)(_split)
+    _two_prod = njit(cache=True)(_two_prod)
+    _dd_add = njit(cache=True)(_dd_add)
+    _dd_mul = njit(cache=True)(_dd_mul)
+    iterate_julia_dd = njit(cache=True)(iterate_julia_dd)
+
+
+def iterate_julia_ref(n, bail, mags):
+    """
+    mpmath reference path with precision auto-escalation.
+    Rounding errors grow like |dz/dc| (tracked in doubles as a mantissa plus a
+    power-of-ten shift); once that would eat into the guard digits, dps is
+    doubled and the orbit restarts from c, so early iterations stay cheap.
+    """
+    dps = REF_START_DPS
+    while True:
+        mpmath.mp.dps = dps
+        c = mpmath.mpc(mpmath.mpf(CX), mpmath.mpf(CY))
+        z = mpmath.mpc(0, 0)
+        deriv, shift = 0j, 0
+        for i in range(n):
+            # dz/dc chain rule: d' = 2 z d + 1
+            deriv = 2 * complex(z) * deriv + 10.0 ** -shift
+            if abs(deriv) > 1e100:
+                deriv *= 1e-100
+                shift += 100
+            digits_lost = shift + math.log10(abs(deriv)) if deriv else 0.0
+            if digits_lost + REF_GUARD_DIGITS > dps:
+                dps = max(2 * dps, int(digits_lost) + REF_GUARD_DIGITS + 1)
+                break
+
+            z = z * z + c
+            mag = float(mpmath.fabs(z))
+            mags[i] = mag
+            if mag > bail:
+                return i + 1
+        else:
+            return n
+
+
+def _split_mpf(x):
+    """Seed a double-double (hi, lo) pair from a high precision value."""
+    hi = float(x)
+    return hi, float(x - hi)
+
+
+if args.gpu:
+    # Only the escape iteration comes back from the GPU, no per-step magnitudes
+    from julia_gpu import JuliaGPU
+    gpu = JuliaGPU()
+    count = int(gpu.sweep(cx, cy, max_iter=MAX_ITER, bailout=BAILOUT)[0, 0])
+    gpu.release()
+    if count < MAX_ITER:
+        print(f"ESCAPED at iteration {count} (GPU)")
+    else:
+        print(f"Did NOT escape after {MAX_ITER} iterations! (GPU)")
+    raise SystemExit(0)
+
+if args.sweep:
+    # Vectorized over c: every perturbation is an independent point for the shared kernel
+    from fractal_engine import escape_counts
+    offsets = (np.arange(args.sweep) - args.sweep // 2) * SWEEP_STEP
+    counts = escape_counts(float(cx) + offsets[None, :], float(cy) + offsets[:, None],
+                           max_iter=MAX_ITER, bailout=BAILOUT)
+    bounded = int((counts == MAX_ITER).sum())
+    print(f"Sweep: {bounded} of {counts.size} points within {SWEEP_STEP * (args.sweep // 2):.1e} did not escape")
+    if bounded < counts.size:
+        print(f"Earliest escape at iteration {int(counts.min())}")
+    raise SystemExit(0)
+
+mags = np.empty(MAX_ITER, dtype=np.float64)
+if args.ref:
+    count = iterate_julia_ref(MAX_ITER, BAILOUT, mags)
+else:
+    cx_hi, cx_lo = _split_mpf(cx)
+    cy_hi, cy_lo = _split_mpf(cy)
+    count = iterate_julia_dd(cx_hi, cx_lo, cy_hi, cy_lo, MAX_ITER, BAILOUT, mags)
 
-z = mpmath.mpc(0, 0)
 escaped = False
 max_mag = 0
 
-for i in range(20000):
-    z = z * z + c
-    mag = float(mpmath.fabs(z))
+for i in range(count):
+    mag = float(mags[i])
     if mag > max_mag:
         max_mag = mag
-    if mag > 1e10:  # Very high bailout
+    if mag > BAILOUT:
         escaped = True
         print(f"ESCAPED at iteration {i}, |z| = {mag}")
         break
@@ -23,4 +190,4 @@ for i in range(20000):
         print(f"Iter {i}: |z| = {mag:.6f}")
 
 if not escaped:
-    print(f"Did NOT escape after 20000 iterations! Max |z| = {max_mag:.6f}")
+    print(f"Did NOT escape after {MAX_ITER} iterations! Max |z| = {max_mag:.6f}")
@@ -1,11 +1,18 @@
+import asyncio
+import httpx  # installed with the ollama package
 
-import requests
-import json
+# orjson is optional - stdlib json is used when missing
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
 
-url = "http://localhost:11434/api/chat"
+base_url = "http://localhost:11434"
 model = "nemotron-3-nano:latest"
 
-system_prompt = """You are a helpful AI assistant. 
+system_prompt = """You are a helpful AI assistant.
 IMPORTANT: Always use the following XML tags for structured output:
 1. Wrap your internal reasoning and step-by-step thinking in <think> tags BEFORE any tool call or final response.
 2. To use a tool, you MUST use the following format:
@@ -19,13 +26,31 @@ payload = {
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": "summarize the front page of reddit"}
     ],
-    "stream": False
+    "stream": True
 }
 
+
+async def main():
+    # One keep-alive connection; the NDJSON stream is parsed line by line as it arrives
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        async with client.stream("POST", "/api/chat", json=payload) as response:
+            print(f"Status: {response.status_code}")
+            thinking_chars = 0
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                obj = _loads(line)
+                message = obj.get("message", {})
+                # Nemotron may stream its reasoning in a separate 'thinking' field
+                thinking_chars += len(message.get("thinking", ""))
+                print(message.get("content", ""), end="", flush=True)
+                if obj.get("done"):
+                    print(f"\n\nThinking chars: {thinking_chars}")
+                    print(f"Final chunk: {obj}")
+
+
 print(f"Testing {model} via RAW HTTP request...")
 try:
-    response = requests.post(url, json=payload)
-    print(f"Status: {response.status_code}")
-    print(f"Full JSON: {json.dumps(response.json(), indent=2)}")
+    asyncio.run(main())
 except Exception as e:
     print(f"Error: {e}")
@@ -1,32 +1,73 @@
 """
 Browser Tool - Playwright automation.
 """
-from playwright.sync_api import sync_playwright, Page, Browser, Playwright
-from typing import Optional
-import time
+from typing import Optional, TYPE_CHECKING
+import os
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page, Browser, BrowserContext, Playwright
+
+# Max characters of page text handed to the LLM
+CONTENT_LIMIT = 2000
+
+# Runs in the page: collapse layout whitespace (so the character budget goes to
+# actual content) and truncate there, so only the kept text crosses the CDP bridge.
+_GET_TEXT_JS = """(limit) => {
+    const body = document.body;
+    if (!body) return ["", false];
+    const text = body.innerText
+        .replace(/[ \\t\\u00a0]+/g, " ")
+        .replace(/\\n\\s*\\n+/g, "\\n\\n")
+        .split("\\n").map(line => line.trim()).join("\\n")
+        .trim();
+    return [text.slice(0, limit), text.length > limit];
+}"""
+
+# Chromium profile kept between runs (cookies, HTTP cache, warm DNS/TLS)
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".pw-profile")
+
+# Default timeout for clicks, fills, waits (navigation keeps Playwright's 30 s)
+ACTION_TIMEOUT_MS = 10_000
+
+# get_content waits at most this long for the network to go quiet
+CONTENT_IDLE_TIMEOUT_MS = 5_000
+
 
 class BrowserTool:
     """Tool for controlling a web browser."""
     
     def __init__(self, headless: bool = False):
         self.headless = headless
-        self._playwright: Optional[Playwright] = None
-        self._browser: Optional[Browser] = None
-        self._page: Optional[Page] = None
-        self._context = None
+        self._playwright: Optional["Playwright"] = None
+        self._browser: Optional["Browser"] = None  # only set for the non-persistent fallback
+        self._context: Optional["BrowserContext"] = None
+        self._page: Optional["Page"] = None
         
     def _ensure_browser(self):
         """Start browser if not running."""
         if not self._playwright:
+            # Imported on first use - Playwright is slow to import and most sessions never browse
+            from playwright.sync_api import sync_playwright
             self._playwright = sync_playwright().start()
         
-        if not self._browser:
-            self._browser = self._playwright.chromium.launch(headless=self.headless)
-            self._context = self._browser.new_context(
-                viewport={'width': 1280, 'height': 720},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            )
-            self._page = self._context.new_page()
+        if not self._context:
+            launch_args = {"headless": self.headless, "args": ["--disable-dev-shm-usage"]}
+            context_args = {
+                "viewport": {'width': 1280, 'height': 720},
+                "user_agent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            }
+            try:
+                self._context = self._playwright.chromium.launch_persistent_context(
+                    user_data_dir=PROFILE_DIR, **launch_args, **context_args
+                )
+            except Exception as e:
+                # Chromium locks the profile directory - another process already has it open
+                print(f"Persistent browser profile unavailable ({e}), using a fresh context")
+                self._browser = self._playwright.chromium.launch(**launch_args)
+                self._context = self._browser.new_context(**context_args)
+            self._context.set_default_timeout(ACTION_TIMEOUT_MS)
+            # A persistent context opens with one blank page already
+            self._page = self._context.pages[0] if self._context.pages else self._context.new_page()
     
     def navigate(self, url: str) -> str:
         """Navigate to a URL."""
@@ -89,16 +130,25 @@ class BrowserTool:
         """Get current page text content."""
         try:
             self._ensure_browser()
+            # Let late XHR content land before reading; a busy page is read as-is
+            try:
+                self._page.wait_for_load_state("networkidle", timeout=CONTENT_IDLE_TIMEOUT_MS)
+            except Exception:
+                pass
             # Get text but limit length to avoid overwhelming LLM
-            content = self._page.inner_text("body")
-            if not content or not content.strip():
+            content, truncated = self._page.evaluate(_GET_TEXT_JS, CONTENT_LIMIT)
+            if not content:
                 return "The page loaded but has no visible text content. It might be an empty page, a canvas, or a loading screen."
-            return content[:2000] + ("..." if len(content) > 2000 else "")
+            return content + ("..." if truncated else "")
         except Exception as e:
             return f"Error getting content: {e}"
     
     def close(self):
         """Close browser resources."""
+        if self._context:
+            self._context.close()
+            self._context = None
+            self._page = None
         if self._browser:
             self._browser.close()
             self._browser = None
@@ -107,7 +157,10 @@ class BrowserTool:
             self._playwright = None
 
 
-# Singleton instance
+# Singleton instance. Deliberately not a pool: the sync Playwright objects are
+# bound to the thread that created them, the persistent profile can only be
+# opened by one Chromium at a time (a second process falls back to a fresh
+# context), and the pro UI runs a single agent session.
 _browser_tool: Optional[BrowserTool] = None
 
 def get_browser() -> BrowserTool:
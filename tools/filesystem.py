@@ -14,8 +14,9 @@ class FileSystemTool:
         """Read contents of a file."""
         try:
             path = os.path.expanduser(path)
+            # Only read what we can return (plus one char to detect truncation)
             with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
+                content = f.read(10001)
             if len(content) > 10000:
                 content = content[:10000] + "\n... (truncated, file too large)"
             return content
@@ -38,13 +39,14 @@ class FileSystemTool:
         try:
             path = os.path.expanduser(path)
             entries = []
-            for entry in os.listdir(path):
-                full_path = os.path.join(path, entry)
-                if os.path.isdir(full_path):
-                    entries.append(f"[DIR] {entry}/")
-                else:
-                    size = os.path.getsize(full_path)
-                    entries.append(f"[FILE] {entry} ({size} bytes)")
+            # scandir reuses the directory entry's type info instead of a stat per check
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        entries.append(f"[DIR] {entry.name}/")
+                    else:
+                        size = entry.stat().st_size
+                        entries.append(f"[FILE] {entry.name} ({size} bytes)")
             return "\n".join(entries) if entries else "(empty directory)"
         except Exception as e:
             return f"Error listing directory: {e}"
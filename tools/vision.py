@@ -1,27 +1,81 @@
 """
 Vision Tool - Screenshot and image handling.
 """
-import base64
 import io
-from PIL import Image, ImageGrab
+import threading
+from PIL import Image, ImageGrab, features
 from typing import Optional, Tuple
 
+# mss is optional - faster screen grabs than ImageGrab, which is used otherwise
+try:
+    import mss
+    HAS_MSS = True
+except ImportError:
+    HAS_MSS = False
+
+# pybase64 is optional - SIMD encoder with the same API, stdlib base64 otherwise
+try:
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode
+
+# Lossy encoding for live previews - an order of magnitude faster than PNG.
+# WEBP when Pillow was built with it, JPEG otherwise.
+if features.check("webp"):
+    PREVIEW_FORMAT, PREVIEW_EXT, PREVIEW_OPTIONS = "WEBP", "webp", {"quality": 85, "method": 0}
+else:
+    PREVIEW_FORMAT, PREVIEW_EXT, PREVIEW_OPTIONS = "JPEG", "jpg", {"quality": 85, "optimize": False}
+
+# Previews are shown in a ~500px high panel; full-resolution captures stay with the LLM paths
+PREVIEW_MAX_EDGE = 960
+
 
 class VisionTool:
     """Tool for capturing and processing screenshots."""
     
+    def __init__(self):
+        # mss handles are tied to the thread that opened them (display / DC handles)
+        self._local = threading.local()
+    
     def capture_screen(self, region: Tuple[int, int, int, int] = None) -> Image.Image:
-        """Capture screen or region."""
+        """Capture screen or region (left, top, right, bottom)."""
+        if HAS_MSS:
+            sct = getattr(self._local, "sct", None)
+            if sct is None:
+                sct = self._local.sct = mss.mss()
+            if region:
+                left, top, right, bottom = region
+                monitor = {"left": left, "top": top, "width": right - left, "height": bottom - top}
+            else:
+                monitor = sct.monitors[1]  # primary monitor, as ImageGrab.grab() does
+            shot = sct.grab(monitor)
+            # Raw BGRA rows straight into an RGB image - no PNG or intermediate copy
+            return Image.frombuffer("RGB", shot.size, shot.bgra, "raw", "BGRX", 0, 1)
         if region:
             return ImageGrab.grab(bbox=region)
         return ImageGrab.grab()
     
-    def screenshot_to_base64(self, region: Tuple[int, int, int, int] = None) -> str:
-        """Capture screenshot and return as base64 string."""
-        img = self.capture_screen(region)
+    def _encode_png(self, region: Tuple[int, int, int, int] = None) -> io.BytesIO:
+        """Capture screenshot and encode it as PNG into an in-memory buffer."""
         buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        return base64.b64encode(buffer.getvalue()).decode()
+        self.capture_screen(region).save(buffer, format='PNG')
+        return buffer
+    
+    def screenshot_to_png_bytes(self, region: Tuple[int, int, int, int] = None) -> bytes:
+        """Capture screenshot and return the encoded PNG bytes."""
+        return self._encode_png(region).getvalue()
+    
+    def screenshot_to_base64(self, region: Tuple[int, int, int, int] = None) -> str:
+        """Capture screenshot and return as base64 string (only for sending to a model)."""
+        # Encode from a view of the buffer - getvalue() would copy the whole PNG first
+        buffer = self._encode_png(region)
+        with buffer.getbuffer() as png:
+            return b64encode(png).decode('ascii')
+    
+    def screenshot_to_file(self, path: str, region: Tuple[int, int, int, int] = None) -> str:
+        """Capture screenshot and encode it straight to path. Returns the path."""
+        self.capture_screen(region).save(path, format='PNG')
+        return path
     
     def save_screenshot(self, path: str, region: Tuple[int, int, int, int] = None) -> str:
         """Capture and save screenshot to file."""
@@ -32,11 +86,26 @@ class VisionTool:
         except Exception as e:
             return f"Error saving screenshot: {e}"
     
+    def save_preview(self, img: Image.Image, path: str, max_edge: int = PREVIEW_MAX_EDGE) -> str:
+        """
+        Encode img to path as a lossy preview (PREVIEW_FORMAT), downscaled so its
+        long edge is at most max_edge. Returns the path.
+        """
+        w, h = img.size
+        scale = max_edge / max(w, h)
+        if scale < 1.0:
+            # Bilinear is plenty for a preview and much cheaper than Lanczos
+            img = img.resize((int(w * scale), int(h * scale)), Image.BILINEAR)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        img.save(path, format=PREVIEW_FORMAT, **PREVIEW_OPTIONS)
+        return path
+    
     def image_to_base64(self, image_path: str) -> str:
         """Convert an image file to base64."""
         try:
             with open(image_path, 'rb') as f:
-                return base64.b64encode(f.read()).decode()
+                return b64encode(f.read()).decode()
         except Exception as e:
             return f"Error encoding image: {e}"
 
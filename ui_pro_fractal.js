@@ -0,0 +1,1512 @@
+(function() {
+    console.log("FRACTAL INITIALIZING...");
+    const vertexShaderSource = `#version 300 es
+        in vec2 a_position;
+        out vec2 v_uv;
+        void main() { 
+            v_uv = a_position;
+            gl_Position = vec4(a_position, 0.0, 1.0); 
+        }
+    `;
+
+    const glslFragmentCode = `#version 300 es
+        precision highp float;
+
+        in vec2 v_uv;
+        out vec4 fragColor;
+
+        // Uniforms
+        uniform vec2 u_resolution;
+        uniform vec2 u_zoom;        // Low precision zoom factor
+        uniform vec2 u_deltaC;      // Low precision offset from Reference
+        uniform int u_maxIter;
+        uniform float u_time;
+
+        // Reference Orbit Textures (High Precision Skeleton) - PRIMARY
+        uniform sampler2D u_refOrbitRe; // Real part of Z_n
+        uniform sampler2D u_refOrbitIm; // Imag part of Z_n
+        uniform int u_refCount;         // Number of points in reference
+
+        // Reference Orbit Textures - SECONDARY (for blending/morphing)
+        uniform sampler2D u_refOrbitRe2;
+        uniform sampler2D u_refOrbitIm2;
+        uniform int u_refCount2;
+        uniform float u_morphBlend;      // 0-1 blend between primary and secondary orbits
+
+        // Audio Ripples
+        uniform vec4 u_ripples[4];
+
+        // Transition brightness (for seamless zoom loop fade)
+        uniform float u_brightness;
+
+        // Morph intensity (controls fractal structure evolution)
+        uniform float u_morphIntensity;
+
+        // Complex Math Helpers
+        vec2 cmul(vec2 a, vec2 b) {
+            return vec2(a.x*b.x - a.y*b.y, a.x*b.y + a.y*b.x);
+        }
+
+        vec2 csqr(vec2 a) {
+            return vec2(a.x*a.x - a.y*a.y, 2.0*a.x*a.y);
+        }
+
+        vec3 palette(float t) {
+            // Original "Cyberpunk" palette
+            vec3 a = vec3(0.02, 0.01, 0.08);   
+            vec3 b = vec3(0.15, 0.8, 1.0);   
+            vec3 c = vec3(1.0, 1.0, 1.0);
+            vec3 d = vec3(0.6, 0.4, 0.5); 
+            return a + b * cos(6.28318 * (c * t + d));
+        }
+
+        void main() {
+            // 1. Calculate pixel's low-precision offset (delta_c) from center
+            // v_uv is already [-1, 1] from Vertex Shader
+            vec2 uv = v_uv;  
+            uv.x *= u_resolution.x / u_resolution.y; 
+
+            // ===== WATER RIPPLE DISTORTION =====
+            // Apply ripple distortion to UV coordinates before fractal calculation
+            // Creates water-like wave effect emanating from center
+            float dist = length(uv);  // Distance from center
+            vec2 distortedUV = uv;
+
+            for (int r = 0; r < 4; r++) {
+                vec4 ripple = u_ripples[r];
+                if (ripple.y > 0.001) {
+                    // ripple.x = time since birth, ripple.y = intensity
+                    float rippleSpeed = 2.0;
+                    float rippleWidth = 0.3;
+                    float ripplePhase = ripple.x * rippleSpeed;
+
+                    // Calculate ripple ring position and strength
+                    float rippleDist = mod(ripplePhase, 3.0);  // Ripple expands outward
+                    float ringStrength = exp(-abs(dist - rippleDist) / rippleWidth);
+
+                    // Apply displacement perpendicular to ripple direction
+                    float displacement = sin(dist * 20.0 - ripplePhase * 8.0) * ringStrength * ripple.y * 0.02;
+                    vec2 dir = normalize(uv + 0.001);  // Direction from center
+                    distortedUV += dir * displacement;
+                }
+            }
+
+            // Scale by zoom (use distorted UV for water effect)
+            vec2 pixel_delta_c = distortedUV / u_zoom; 
+
+            // Total delta = Center Offset (u_deltaC) + Pixel Offset
+            vec2 delta_c = u_deltaC + pixel_delta_c;
+
+            // Morphing now applied in iteration loop, not here
+
+            vec2 delta_n = vec2(0.0); // delta_0 = 0 (correct perturbation start)
+
+            float iter = 0.0;
+            bool escaped = false;
+            bool glitched = false;
+            vec2 final_z = vec2(0.0);
+
+            // Use minimum of both reference counts
+            int maxRef = min(u_refCount, u_refCount2);
+
+            // Perturbation Loop with reference orbit blending
+            for(int i = 0; i < u_maxIter; i++) {
+                if (i >= maxRef) break;
+
+                // Fetch Z_n from PRIMARY orbit
+                float z_re1 = texelFetch(u_refOrbitRe, ivec2(i, 0), 0).r;
+                float z_im1 = texelFetch(u_refOrbitIm, ivec2(i, 0), 0).r;
+                vec2 Z_n1 = vec2(z_re1, z_im1);
+
+                // Fetch Z_n from SECONDARY orbit
+                float z_re2 = texelFetch(u_refOrbitRe2, ivec2(i, 0), 0).r;
+                float z_im2 = texelFetch(u_refOrbitIm2, ivec2(i, 0), 0).r;
+                vec2 Z_n2 = vec2(z_re2, z_im2);
+
+                // Blend between orbits based on u_morphBlend (0=primary, 1=secondary)
+                vec2 Z_n = mix(Z_n1, Z_n2, u_morphBlend);
+
+                // Perturbation Formula: delta_{n+1} = 2*Z_n*delta_n + delta_n^2 + delta_c
+                // Apply subtle rotation twist for additional morphing
+
+                vec2 linearVal = cmul(2.0 * Z_n, delta_n);
+                vec2 quadroVal = csqr(delta_n);
+
+                delta_n = linearVal + quadroVal + delta_c;
+
+                // Check absolute escape
+                vec2 z_abs = Z_n + delta_n;
+                float mag2 = dot(z_abs, z_abs);
+                if (mag2 > 256.0) { // Higher bailout for smooth shading
+                    escaped = true;
+                    iter = float(i);
+                    final_z = z_abs;
+                    break;
+                }
+            }
+
+            // DEBUG: Check Reference Data Integrity
+            if (false) { 
+                float z0_r = texelFetch(u_refOrbitRe, ivec2(0,0), 0).r;
+                if (abs(z0_r) < 0.0001) {
+                     // Z0 is 0 (Good)
+                     float z1_r = texelFetch(u_refOrbitRe, ivec2(1,0), 0).r;
+                     if (abs(z1_r + 0.5) < 0.01) {
+                         fragColor = vec4(0.0, 0.0, 1.0, 1.0); // BLUE = GOOD
+                     } else if (abs(z1_r) < 0.0001) {
+                         fragColor = vec4(0.0, 1.0, 1.0, 1.0); // CYAN = Z1 IS ZERO
+                     } else {
+                         fragColor = vec4(abs(z1_r + 0.5), 1.0, 0.0, 1.0); // Custom Yellow
+                     }
+                } else {
+                    fragColor = vec4(1.0, 0.0, 0.0, 1.0); // RED = Z0 BAD
+                }
+                return;
+            }
+
+            if (glitched) {
+               fragColor = vec4(0.0, 0.0, 0.0, 1.0);
+            }
+            else if (escaped) {
+                // Smooth Iteration Count (Renormalization)
+                float log_zn = log(dot(final_z, final_z)) / 2.0;
+                float nu = log(log_zn / log(2.0)) / log(2.0);
+                float smooth_iter = iter + 1.0 - nu;
+
+                // Original Aesthetic Logic
+                vec3 col = palette(smooth_iter * 0.02 + u_time * 0.02);
+                float glow = 1.0 / (smooth_iter * 0.03 + 0.5);
+                col += vec3(0.2, 0.1, 0.5) * glow;
+
+                // Ripples - Audio-reactive color waves
+                for (int r = 0; r < 4; r++) {
+                    vec4 ripple = u_ripples[r];
+                    if (ripple.y > 0.001) {
+                        // ripple.x = time since birth, ripple.y = intensity
+                        // Create expanding wave pattern based on iteration count
+                        float wave = sin(smooth_iter * 0.5 + ripple.x * 12.0) * ripple.y;
+                        // More dramatic color shift - cyan/magenta based on wave
+                        col += vec3(0.3, 0.5, 0.8) * wave * 3.0;  // 3x intensity boost
+                    }
+                }
+
+                // ===== RADIAL COLOR PULSE =====
+                // Creates expanding color wave from center to edge of screen
+                float screenDist = length(v_uv);  // Distance from screen center
+                for (int r = 0; r < 4; r++) {
+                    vec4 ripple = u_ripples[r];
+                    if (ripple.y > 0.001) {
+                        float pulseSpeed = 3.0;
+                        float pulsePhase = ripple.x * pulseSpeed;
+                        // Expanding ring from center
+                        float ringDist = mod(pulsePhase, 2.0);
+                        float ringWidth = 0.2;
+                        float ringStrength = exp(-abs(screenDist - ringDist) / ringWidth) * ripple.y;
+                        // Add warm color pulse (orange/pink)
+                        col += vec3(1.0, 0.4, 0.3) * ringStrength * 0.5;
+                    }
+                }
+
+                fragColor = vec4(clamp(col, 0.0, 1.0) * u_brightness, 1.0);
+            } else {
+                float inner = iter / float(u_maxIter);
+                vec3 col = vec3(0.02, 0.01, 0.05) + vec3(0.02, 0.03, 0.08) * inner;
+                fragColor = vec4(col * u_brightness, 1.0);
+            }
+        }
+    `;
+
+    function start() {
+        if (document.getElementById('fractal-canvas')) return;
+        const canvas = document.createElement('canvas');
+        canvas.id = 'fractal-canvas';
+        Object.assign(canvas.style, { position: 'fixed', top: '0', left: '0', width: '100vw', height: '100vh', zIndex: '-1', pointerEvents: 'none' });
+        document.body.appendChild(canvas);
+
+        const gl = canvas.getContext('webgl2', { preserveDrawingBuffer: true, antialias: false, powerPreference: 'high-performance' });
+        if (!gl) return;
+
+        // Enable Floating Point Extensions
+        gl.getExtension('EXT_color_buffer_float');
+        gl.getExtension('OES_texture_float_linear'); // Good for sampling
+
+        function createShader(gl, type, source) {
+            const s = gl.createShader(type);
+            gl.shaderSource(s, source);
+            gl.compileShader(s);
+            if (!gl.getShaderParameter(s, gl.COMPILE_STATUS)) {
+                console.error("Shader Compile Error:", gl.getShaderInfoLog(s));
+                gl.deleteShader(s);
+                return null;
+            }
+            return s;
+        }
+
+        // Helper to parse Base64 Float32 data
+        function base64ToFloat32Array(b64) {
+            const binary_string = window.atob(b64);
+            const len = binary_string.length;
+            const bytes = new Uint8Array(len);
+            for (let i = 0; i < len; i++) {
+                bytes[i] = binary_string.charCodeAt(i);
+            }
+            return new Float32Array(bytes.buffer);
+        }
+
+        // Create 1D Float Texture
+        function createRefTexture(gl, floatData) {
+            const tex = gl.createTexture();
+            gl.bindTexture(gl.TEXTURE_2D, tex);
+            // WebGL 2 supports R32F
+            gl.texImage2D(gl.TEXTURE_2D, 0, gl.R32F, floatData.length, 1, 0, gl.RED, gl.FLOAT, floatData);
+            gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MIN_FILTER, gl.NEAREST);
+            gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MAG_FILTER, gl.NEAREST);
+            gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_S, gl.CLAMP_TO_EDGE);
+            gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_T, gl.CLAMP_TO_EDGE);
+            return tex;
+        }
+
+        const program = gl.createProgram();
+        console.log("DEBUG: Creating VS");
+        const vs = createShader(gl, gl.VERTEX_SHADER, vertexShaderSource);
+        console.log("DEBUG: Creating FS");
+        const fs = createShader(gl, gl.FRAGMENT_SHADER, glslFragmentCode);
+        if (!vs || !fs) { console.error("DEBUG: Shader creation failed"); return; }
+
+        console.log("DEBUG: Attaching shaders");
+        gl.attachShader(program, vs);
+        gl.attachShader(program, fs);
+        gl.linkProgram(program);
+
+        if (!gl.getProgramParameter(program, gl.LINK_STATUS)) {
+             console.error("Program Link Error:", gl.getProgramInfoLog(program));
+             return;
+        }
+        console.log("DEBUG: Link success, using program");
+        gl.useProgram(program);
+
+        const locRes = gl.getUniformLocation(program, "u_resolution");
+        const locTime = gl.getUniformLocation(program, "u_time");
+        const locZoom = gl.getUniformLocation(program, "u_zoom");
+        const locDeltaC = gl.getUniformLocation(program, "u_deltaC");
+        const locMaxIter = gl.getUniformLocation(program, "u_maxIter");
+        const locBrightness = gl.getUniformLocation(program, "u_brightness");
+        const locMorphIntensity = gl.getUniformLocation(program, "u_morphIntensity");
+
+        // Texture Uniforms - PRIMARY
+        const locRefRe = gl.getUniformLocation(program, "u_refOrbitRe");
+        const locRefIm = gl.getUniformLocation(program, "u_refOrbitIm");
+        const locRefCount = gl.getUniformLocation(program, "u_refCount");
+
+        // Texture Uniforms - SECONDARY (for morphing between orbits)
+        const locRefRe2 = gl.getUniformLocation(program, "u_refOrbitRe2");
+        const locRefIm2 = gl.getUniformLocation(program, "u_refOrbitIm2");
+        const locRefCount2 = gl.getUniformLocation(program, "u_refCount2");
+        const locMorphBlend = gl.getUniformLocation(program, "u_morphBlend");
+
+        // Initial Data Load - ALL ORBITS
+        let refDataRe, refDataIm, texRefRe, texRefIm;
+        let refDataRe2, refDataIm2, texRefRe2, texRefIm2;
+        let refCount = 0;
+        let refCount2 = 0;
+        let currentOrbitIndex = 0;  // Track which pair we're morphing between
+
+        if (window.INITIAL_REF_ORBIT) {
+            try {
+                console.log("Loading Initial Reference Orbit...");
+                refDataRe = base64ToFloat32Array(window.INITIAL_REF_ORBIT.re);
+                refDataIm = base64ToFloat32Array(window.INITIAL_REF_ORBIT.im);
+                refCount = window.INITIAL_REF_ORBIT.count;
+
+                texRefRe = createRefTexture(gl, refDataRe);
+                texRefIm = createRefTexture(gl, refDataIm);
+                console.log(`Primary Reference Orbit Loaded: ${refCount} points`);
+
+                // Load secondary orbit (second in array for blending)
+                if (window.REF_ORBITS && window.REF_ORBITS.length > 1) {
+                    refDataRe2 = base64ToFloat32Array(window.REF_ORBITS[1].re);
+                    refDataIm2 = base64ToFloat32Array(window.REF_ORBITS[1].im);
+                    refCount2 = window.REF_ORBITS[1].count;
+                    texRefRe2 = createRefTexture(gl, refDataRe2);
+                    texRefIm2 = createRefTexture(gl, refDataIm2);
+                    console.log(`Secondary Reference Orbit Loaded: ${refCount2} points`);
+                } else {
+                    // If only one orbit, use same for both
+                    texRefRe2 = texRefRe;
+                    texRefIm2 = texRefIm;
+                    refCount2 = refCount;
+                    console.log("Using same orbit for primary and secondary (no blending)");
+                }
+            } catch(e) {
+                console.error("Failed to load reference orbit:", e);
+            }
+        }
+
+        // Multi-ripple uniform locations
+        const locRipples = [
+            gl.getUniformLocation(program, "u_ripples[0]"),
+            gl.getUniformLocation(program, "u_ripples[1]"),
+            gl.getUniformLocation(program, "u_ripples[2]"),
+            gl.getUniformLocation(program, "u_ripples[3]")
+        ];
+
+        const buffer = gl.createBuffer();
+        gl.bindBuffer(gl.ARRAY_BUFFER, buffer);
+        gl.bufferData(gl.ARRAY_BUFFER, new Float32Array([-1, -1, 1, -1, -1, 1, -1, 1, 1, -1, 1, 1]), gl.STATIC_DRAW);
+        const pos = gl.getAttribLocation(program, "a_position");
+        gl.enableVertexAttribArray(pos);
+        gl.vertexAttribPointer(pos, 2, gl.FLOAT, false, 0, 0);
+
+        // ===== CONFIGURABLE PARAMETERS =====
+        // These can be tuned via fractal_config.json
+        let cfg = {
+            zoom: { rate: 0.03, minLog: 0, maxLog: 10, deadspaceThresholdSeconds: 0.5, reverseSlowdown: 0.95, minZoomOutDistance: 2.5 },
+            iteration: { baseCount: 300, maxCount: 1000, logMultiplier: 60 },
+            animation: { morphRate: 0.12, powerBase: 1.2, powerRange: 0.2, panRadius: 0.01, panSpeed: 0.15 },
+            steering: { smoothing: 0.97, strength: 0.015, probeRadius: 0.25, gradientThreshold: 0.05, probeIterations: 250, searchRadiusMultiplier: 4.0 },
+            traps: { circleRadiusBase: 0.5, circleRadiusRange: 0.3, circleSpeed: 0.2, pointDistance: 0.3, pointSpeedX: 0.15, pointSpeedY: 0.18, lineSpeed: 0.1 }
+        };
+
+        // Load config from file (async, non-blocking)
+        fetch('/file=fractal_config.json').then(r => r.json()).then(c => { cfg = {...cfg, ...c}; console.log('Fractal config loaded:', cfg); updateConfigDisplay(); }).catch(() => console.log('Using default fractal config'));
+
+        // ===== SETTINGS PANEL INTEGRATION =====
+        // Global settings controlled by the settings panel
+        window.fractalSettings = {
+            enabled: true,
+            morphIntensity: 1.0,
+            rippleIntensity: 1.0,
+            colorPulseIntensity: 1.0,
+            bassZoomIntensity: 0.1  // Subtle bass zoom effect
+        };
+
+        // Update config display in settings panel
+        function updateConfigDisplay() {
+            const display = document.getElementById('config-display');
+            if (display && cfg) {
+                display.innerHTML = `Zoom Rate: ${cfg.zoom?.rate?.toFixed(3) || '--'}<br>Max Iter: ${cfg.iteration?.maxCount || '--'}<br>Morph Rate: ${cfg.animation?.morphRate?.toFixed(3) || '--'}`;
+            }
+        }
+
+        // Setup settings panel event listeners
+        function setupSettingsHandlers() {
+            // Fractal enable/disable toggle
+            const fractalToggle = document.getElementById('fractal-enabled');
+            if (fractalToggle) {
+                fractalToggle.addEventListener('change', (e) => {
+                    window.fractalSettings.enabled = e.target.checked;
+                    console.log('Fractal enabled:', window.fractalSettings.enabled);
+                });
+            }
+
+            // Morph intensity slider
+            const morphSlider = document.getElementById('morph-intensity');
+            const morphValue = document.getElementById('morph-value');
+            if (morphSlider) {
+                morphSlider.addEventListener('input', (e) => {
+                    window.fractalSettings.morphIntensity = parseFloat(e.target.value);
+                    if (morphValue) morphValue.textContent = parseFloat(e.target.value).toFixed(1);
+                });
+            }
+
+            // Ripple (Water Distortion) intensity slider
+            const rippleSlider = document.getElementById('ripple-intensity');
+            const rippleValue = document.getElementById('ripple-value');
+            if (rippleSlider) {
+                rippleSlider.addEventListener('input', (e) => {
+                    window.fractalSettings.rippleIntensity = parseFloat(e.target.value);
+                    if (rippleValue) rippleValue.textContent = parseFloat(e.target.value).toFixed(1);
+                });
+            }
+
+            // Color Pulse intensity slider
+            const pulseSlider = document.getElementById('pulse-intensity');
+            const pulseValue = document.getElementById('pulse-value');
+            if (pulseSlider) {
+                pulseSlider.addEventListener('input', (e) => {
+                    window.fractalSettings.colorPulseIntensity = parseFloat(e.target.value);
+                    if (pulseValue) pulseValue.textContent = parseFloat(e.target.value).toFixed(1);
+                });
+            }
+
+            // Bass zoom intensity slider
+            const bassSlider = document.getElementById('bass-intensity');
+            const bassValue = document.getElementById('bass-value');
+            if (bassSlider) {
+                bassSlider.addEventListener('input', (e) => {
+                    window.fractalSettings.bassZoomIntensity = parseFloat(e.target.value);
+                    if (bassValue) bassValue.textContent = parseFloat(e.target.value).toFixed(1);
+                });
+            }
+
+            // Temperature slider (LLM)
+            const tempSlider = document.getElementById('temperature');
+            const tempValue = document.getElementById('temp-value');
+            if (tempSlider) {
+                tempSlider.addEventListener('input', (e) => {
+                    window.llmSettings = window.llmSettings || {};
+                    window.llmSettings.temperature = parseFloat(e.target.value);
+                    if (tempValue) tempValue.textContent = parseFloat(e.target.value).toFixed(1);
+                });
+            }
+
+            // Context length slider (LLM)
+            const ctxSlider = document.getElementById('context-length');
+            const ctxValue = document.getElementById('ctx-value');
+            if (ctxSlider) {
+                ctxSlider.addEventListener('input', (e) => {
+                    window.llmSettings = window.llmSettings || {};
+                    window.llmSettings.contextLength = parseInt(e.target.value);
+                    if (ctxValue) ctxValue.textContent = e.target.value;
+                });
+            }
+
+            // Refresh effects button - uses global function
+            const refreshBtn = document.getElementById('refresh-effects-btn');
+            if (refreshBtn) {
+                refreshBtn.addEventListener('click', () => {
+                    window.refreshFractalEffects();
+                    // Visual feedback
+                    refreshBtn.textContent = '✓ Refreshed!';
+                    setTimeout(() => { refreshBtn.textContent = '🔄 Refresh Effects'; }, 1500);
+                });
+                console.log('Refresh button handler attached');
+            } else {
+                console.warn('Refresh button not found in DOM');
+            }
+
+            // Apply LLM Settings button - syncs to hidden Gradio components
+            const applyLLMBtn = document.getElementById('apply-llm-settings-btn');
+            if (applyLLMBtn) {
+                applyLLMBtn.addEventListener('click', () => {
+                    console.log('Applying LLM settings...');
+                    const systemPrompt = document.getElementById('system-prompt')?.value || '';
+                    const temperature = parseFloat(document.getElementById('temperature')?.value || 0.6);
+                    const contextLength = parseInt(document.getElementById('context-length')?.value || 2048);
+
+                    // Store in window for Python to read via custom event
+                    window.llmSettings = { systemPrompt, temperature, contextLength };
+
+                    // Find hidden Gradio components and update them
+                    const hiddenPrompt = document.querySelector('#llm-system-prompt-hidden textarea');
+                    const hiddenTemp = document.querySelector('#llm-temperature-hidden input');
+                    const hiddenCtx = document.querySelector('#llm-context-hidden input');
+
+                    if (hiddenPrompt) {
+                        hiddenPrompt.value = systemPrompt;
+                        hiddenPrompt.dispatchEvent(new Event('input', { bubbles: true }));
+                    }
+                    if (hiddenTemp) {
+                        hiddenTemp.value = temperature;
+                        hiddenTemp.dispatchEvent(new Event('input', { bubbles: true }));
+                    }
+                    if (hiddenCtx) {
+                        hiddenCtx.value = contextLength;
+                        hiddenCtx.dispatchEvent(new Event('input', { bubbles: true }));
+                    }
+
+                    // Click the hidden apply button to trigger Python handler
+                    const applyBtn = document.querySelector('#apply-llm-btn');
+                    if (applyBtn) applyBtn.click();
+
+                    // Visual feedback
+                    applyLLMBtn.textContent = '✓ Applied!';
+                    setTimeout(() => { applyLLMBtn.textContent = '✓ Apply LLM Settings'; }, 1500);
+                });
+            }
+
+            updateConfigDisplay();
+        }
+
+        // ===== GLOBAL REFRESH FUNCTION =====
+        // Can be called from button or automatically
+        window.refreshFractalEffects = function() {
+            console.log('=== REFRESH FRACTAL EFFECTS ===');
+
+            // Reset all ripple state
+            window.ripples = [];
+            window.avgBeatDelta = 0.01;
+            window.lastBeatEnergy = 0;
+            window.globalAudioTime = 0;
+            console.log('Ripple state reset');
+
+            // Reset zoom and time accumulators to prevent precision issues
+            accumulatedTime = 0;
+            accumulatedZoomLog = -5;  // Start in blackness for seamless transition
+            lastRebaseZoom = -5;
+            startupTime = performance.now();  // Reset startup delay timer
+            window.smoothedMaxIter = undefined;  // Will reinitialize
+            console.log('Zoom and time accumulators reset');
+
+            // Reset morph state completely with NEW random phases for variety
+            if (window.morphState) {
+                window.morphState.morphTime = 0;
+                window.morphState.smoothedBlend = 0.5;
+                window.morphState.smoothedSpeed = 0.5;
+                window.morphState.mode = 'explore';
+                window.morphState.freezeTimer = 0;
+                window.morphState.lastBrightness = 50;
+                // NEW random phases each reset for unique patterns
+                window.morphState.randomPhase = Math.random() * 628.0;
+                window.morphState.secondaryPhase = Math.random() * 314.0;
+                console.log(`Morph state reset with new phases: ${window.morphState.randomPhase.toFixed(2)}, ${window.morphState.secondaryPhase.toFixed(2)}`);
+            }
+
+            // Reset black screen detection
+            window.blackScreenStartTime = 0;
+            window.blackScreenTotalTime = 0;
+            window.autoMorphBoost = 0;
+
+            // Force audio re-initialization by resetting isAudioActive
+            // This triggers the polling loop to re-establish the connection
+            isAudioActive = false;
+            console.log('Audio connection will be re-established on next poll');
+
+            // Resume audio context if suspended
+            if (window.audioCtx && window.audioCtx.state === 'suspended') {
+                window.audioCtx.resume();
+                console.log('Audio context resumed');
+            }
+
+            // Reload config
+            fetch('/file=fractal_config.json')
+                .then(r => r.json())
+                .then(c => { 
+                    cfg = {...cfg, ...c}; 
+                    console.log('Config reloaded:', cfg); 
+                    updateConfigDisplay(); 
+                })
+                .catch(() => console.log('Config reload skipped'));
+        };
+
+        // ===== AUTOMATIC 4-MINUTE RESET =====
+        // Prevents floating-point precision issues during long songs
+        const RESET_INTERVAL_MS = 4 * 60 * 1000; // 4 minutes
+        setInterval(() => {
+            console.log('Auto-reset triggered (4 min interval)');
+            window.refreshFractalEffects();
+        }, RESET_INTERVAL_MS);
+
+        // Delayed setup to ensure DOM is ready - retry multiple times
+        function attemptSetup(retries) {
+            const refreshBtn = document.getElementById('refresh-effects-btn');
+            if (refreshBtn) {
+                console.log('Settings handlers setup successful');
+                setupSettingsHandlers();
+            } else if (retries > 0) {
+                console.log('Waiting for settings panel DOM...', retries);
+                setTimeout(() => attemptSetup(retries - 1), 500);
+            } else {
+                console.warn('Settings panel not found after retries');
+            }
+        }
+        setTimeout(() => attemptSetup(10), 1000);
+
+        const startTime = Date.now();
+        let currentZoomLog = 0;
+        let actualZoomRate = cfg.zoom.rate;
+
+        // ========== MANDELBROT - MISIUREWICZ POINT INFINITE ZOOM ==========
+        // Seahorse Valley spiral - on boundary with infinite self-similar detail!
+        const TARGET_X = -0.743643887037158704752191506114774;
+        const TARGET_Y = 0.131825904205311970493132056385139;
+        const MAX_ZOOM_LOG = 48;  // Extended well past previous limit (~10^14)
+
+        // Camera locked to Misiurewicz point
+        let centerX = TARGET_X;
+        let centerY = TARGET_Y;
+
+        // Smooth transitions
+        let smoothPauseFactor = 1.0;
+        let smoothZoomRate = cfg.zoom.rate;
+
+        function splitDouble(d) {
+            const hi = Math.fround(d);
+            const lo = d - hi;
+            return [hi, lo];
+        }
+
+        let lastFrameTime = performance.now();
+        let smoothedDelta = 0.0166;
+        let accumulatedTime = 0;
+        let accumulatedZoomLog = -5;  // Start zoomed out in blackness for seamless reset
+        let startupTime = performance.now();  // Track startup for delayed black screen detection
+
+        // ===== TRUE INFINITE ZOOM - Rebasing System =====
+        // Track high-precision center as strings for rebasing
+        let currentCenterX = "-0.743643887037158704752191506114774";
+        let currentCenterY = "0.131825904205311970493132056385139";
+        let rebaseInProgress = false;
+        let lastRebaseZoom = 0;
+        const REBASE_THRESHOLD = 25.0;  // Deeper zoom before reset (~10^10x) - cooldowns handle oscillation
+        const REBASE_COOLDOWN = 15.0;   // Full zoom cycle through interesting levels before reset
+
+        // Function to reset zoom seamlessly (self-similarity means the pattern repeats)
+        function resetZoomSeamlessly() {
+            console.log("=== SEAMLESS ZOOM RESET (self-similarity) ===");
+            // The Misiurewicz point has self-similar structure
+            // Resetting zoom creates a natural loop as the pattern repeats
+            accumulatedZoomLog = -5;  // Start in blackness for seamless transition
+            lastRebaseZoom = accumulatedZoomLog;
+            startupTime = performance.now();  // Reset startup delay for black screen detection
+            console.log("Zoom reset to:", accumulatedZoomLog);
+        }
+
+        // Ripple State - MULTI-RIPPLE SYSTEM (on window for settings access)
+        // Each beat spawns a new ripple wave with its own birth time
+        const MAX_RIPPLES = 6;  // Number of concurrent ripple waves
+        window.ripples = [];  // Array of {birthTime, intensity, type} objects
+        window.lastBeatEnergy = 0;
+        window.avgBeatDelta = 0.01; // Adaptive threshold baseline
+        window.globalAudioTime = 0;  // Cumulative audio-synced time
+        // Local aliases for convenience
+        let ripples = window.ripples;
+        let lastBeatEnergy = window.lastBeatEnergy;
+        let avgBeatDelta = window.avgBeatDelta;
+        let globalAudioTime = window.globalAudioTime;
+
+        // Sync Cleanup State
+        let activeSyncInterval = null;
+        let activeCleanupListeners = null;
+
+        // ===== AUDIO SYNC SETUP =====
+        let audioCtx, analyser, source;
+        let audioDataArray;
+        let isAudioActive = false;
+        let bassEnergy = 0;
+        let midEnergy = 0;
+        let highEnergy = 0;
+
+        function setupAudio() {
+            // Audio Context Global
+            window.audioCtx = null;
+
+            // Debug overlay REMOVED for production
+            /* 
+            if (!window.audioDebug) { ... }
+            */
+            window.audioDebug = null; 
+
+
+            // Helper: Recursive Shadow DOM Search
+            function findDeepAudio(root) {
+                let audios = Array.from(root.querySelectorAll('audio'));
+                const all = root.querySelectorAll('*');
+                for (const el of all) {
+                    if (el.shadowRoot) {
+                        audios = audios.concat(findDeepAudio(el.shadowRoot));
+                    }
+                }
+                return audios;
+            }
+
+            // POLLING LOOP: Check every 500ms
+            const pollInterval = setInterval(() => {
+                if (isAudioActive) {
+                    if (window.audioCtx && window.audioCtx.state === 'suspended') window.audioCtx.resume();
+                    return;
+                }
+
+                // Deep scan for ALL audio elements (Light + Shadow DOM)
+                const audioEls = findDeepAudio(document);
+
+                if (audioEls.length === 0) {
+                    if (window.audioDebug) window.audioDebug.innerText = "Status: Searching DOM for <audio>...";
+                    return;
+                }
+
+                // Find the one that is actively playing
+                let activeEl = null;
+                for (const el of audioEls) {
+                    if (!el.paused && el.currentTime > 0) {
+                        activeEl = el;
+                        break;
+                    }
+                }
+
+                if (!activeEl) {
+                    // Debug info for the first few elements found
+                    const count = audioEls.length;
+                    const first = audioEls[0];
+                    const sName = first.src ? first.src.split('/').pop().substring(0, 10) : "NoSrc";
+                    const debugInfo = `Found ${count}. 1st: P:${first.paused} T:${first.currentTime.toFixed(1)}`;
+                    if (window.audioDebug) window.audioDebug.innerText = `Status: Waiting... ${debugInfo}`;
+                    return;
+                }
+
+                const audioEl = activeEl;
+
+                // FOUND PLAYING ELEMENT!
+                console.log("AUDIO STARTED! Hooking up visualizer...");
+                if (window.audioDebug) window.audioDebug.innerText = "Status: Play Detected! Starting Fetch...";
+
+                // Stop polling? No, keep it running to resume context if needed, but shield init logic
+                // Actually, let's set isAudioActive=true *inside* the success block
+
+                // INIT LOGIC
+                try {
+                    const AudioContext = window.AudioContext || window.webkitAudioContext;
+                    audioCtx = new AudioContext();
+                    window.audioCtx = audioCtx; // Global ref
+
+                    analyser = audioCtx.createAnalyser();
+                    analyser.fftSize = 2048;
+                    const bufferLength = analyser.frequencyBinCount;
+                    audioDataArray = new Uint8Array(bufferLength);
+
+                    // Anti-optimization Gain
+                    const gainNode = audioCtx.createGain();
+                    gainNode.gain.value = 0.001; 
+                    analyser.connect(gainNode);
+                    gainNode.connect(audioCtx.destination);
+
+                    // Resume on click (backup)
+                    document.body.addEventListener('click', () => {
+                        if (audioCtx.state === 'suspended') audioCtx.resume();
+                    });
+
+                    // Strategy Choice
+                    const src = audioEl.currentSrc || audioEl.src;
+
+                    // 1. Stream
+                    if (audioEl.srcObject) {
+                        console.log("Strategy: MediaStream");
+                        if (window.audioDebug) window.audioDebug.innerText = "Status: Stream Source...";
+                        const source = audioCtx.createMediaStreamSource(audioEl.srcObject);
+                        source.connect(analyser);
+                        isAudioActive = true;
+                        // Clear polling? Nah, safe to keep checking 
+                        return;
+                    }
+
+                    // 2. Fetch & Decode
+                    if (src) {
+                        console.log("Strategy: Fetch & Decode", src);
+                        if (window.audioDebug) window.audioDebug.innerText = "Status: Downloading...";
+
+                        // Mark active so we don't retry fetch
+                        isAudioActive = true; 
+
+                        fetch(src)
+                            .then(r => r.arrayBuffer())
+                            .then(b => audioCtx.decodeAudioData(b))
+                            .then(audioBuffer => {
+                                // Peak Check
+                                const raw = audioBuffer.getChannelData(0);
+                                let peak = 0;
+                                for(let i=0; i<raw.length; i+=100) {
+                                    const v = Math.abs(raw[i]);
+                                    if(v > peak) peak = v;
+                                }
+                                if (window.audioDebug) window.audioDebug.innerText = `Status: Decoded! Peak: ${peak.toFixed(4)}`;
+
+                                startBufferSync(audioBuffer, audioEl);
+                            })
+                            .catch(e => {
+                                console.error("Fetch Error:", e);
+                                isAudioActive = false; // Allow retry
+                                if (window.audioDebug) window.audioDebug.innerText = "Error: " + e.message;
+                            });
+                    }
+
+                } catch(e) {
+                     console.error("Init Error:", e);
+                     if (window.audioDebug) window.audioDebug.innerText = "Init Fail: " + e.message;
+                }
+
+            }, 500); // End Interval
+
+            // Helper: Sync Buffer Logic
+            function startBufferSync(decodedBuffer, element) {
+                 let bufferSource = null;
+                 let lastSyncTime = 0;
+                 let lastCtxTime = 0;
+
+                 function playBuffer(startTime) {
+                     if (bufferSource) try { bufferSource.stop(); } catch(e){}
+                     bufferSource = audioCtx.createBufferSource();
+                     bufferSource.buffer = decodedBuffer;
+                     bufferSource.connect(analyser); // Connect to analyser
+
+                     let offset = startTime;
+                     if (offset >= decodedBuffer.duration) offset = 0;
+
+                     bufferSource.start(0, offset);
+                     lastSyncTime = offset;
+                     lastCtxTime = audioCtx.currentTime;
+
+                     bufferSource.onended = () => { /* clean */ };
+                 }
+
+                 function stopBuffer() {
+                    if (bufferSource) { try { bufferSource.stop(); } catch(e){} bufferSource = null; }
+                 }
+
+                 // Sync Interval (runs inside the closure)
+                 // CLEANUP OLD INTERVAL
+                 if (activeSyncInterval) clearInterval(activeSyncInterval);
+                 if (activeCleanupListeners) activeCleanupListeners();
+
+                 activeSyncInterval = setInterval(() => {
+                    if (!element.paused) {
+                        if (!bufferSource) playBuffer(element.currentTime);
+                        else {
+                            // Drift Correction - TIGHTER SYNC
+                            const currentBufferTime = lastSyncTime + (audioCtx.currentTime - lastCtxTime);
+                            // If drift > 0.05s, resync
+                            if (Math.abs(element.currentTime - currentBufferTime) > 0.05) {
+                                playBuffer(element.currentTime);
+                            }
+                        }
+                    } else {
+                        if (bufferSource) stopBuffer();
+                    }
+                 }, 100); 
+
+                 // Event Handlers
+                 const onSeek = () => { if(!element.paused) playBuffer(element.currentTime); };
+                 const onPause = stopBuffer;
+                 const onPlay = () => {
+                    playBuffer(element.currentTime);
+                    // Reset stats using window scope
+                    window.avgBeatDelta = 0.01;
+                    window.lastBeatEnergy = 0;
+                    window.globalAudioTime = 0;
+                    window.ripples = [];
+                 };
+                 const onLoaded = () => {
+                    window.avgBeatDelta = 0.01;
+                    window.lastBeatEnergy = 0;
+                    window.globalAudioTime = 0;
+                    window.ripples = [];
+                    console.log("New Track Loaded - All Stats Reset");
+                    // Full refresh for new song
+                    if (typeof window.refreshFractalEffects === 'function') {
+                        window.refreshFractalEffects();
+                    }
+                 };
+
+                 element.addEventListener('seeking', onSeek);
+                 element.addEventListener('pause', onPause);
+                 element.addEventListener('play', onPlay);
+                 element.addEventListener('loadeddata', onLoaded);
+
+                 // Store cleanup function
+                 activeCleanupListeners = () => {
+                     element.removeEventListener('seeking', onSeek);
+                     element.removeEventListener('pause', onPause);
+                     element.removeEventListener('play', onPlay);
+                     element.removeEventListener('loadeddata', onLoaded);
+                     if (bufferSource) stopBuffer();
+                 };
+            }
+        }
+
+        // Start immediately
+        setupAudio();
+
+        function render(now) {
+            // Check if fractal is disabled via settings
+            if (!window.fractalSettings?.enabled) {
+                requestAnimationFrame(render);
+                return;
+            }
+
+            // Calculate actual delta time
+            const dt = (now - lastFrameTime) * 0.001;
+            lastFrameTime = now;
+
+            // Temporal smoothing of delta-time (90/10 blend)
+            // This prevents micro-stutters from browser scheduling issues
+            if (dt > 0 && dt < 0.1) { // Sanity check to avoid jumps after tab switch
+                smoothedDelta = smoothedDelta * 0.9 + dt * 0.1;
+            }
+
+            // Increment time accumulator based on SMOOTHED delta
+
+            // ===== AUDIO ANALYSIS =====
+            let audioZoomBoost = 0;
+            let audioMorphBoost = 1.0;
+
+            if (isAudioActive && audioDataArray) {
+                analyser.getByteFrequencyData(audioDataArray);
+
+                // Calculate energy bands
+                const bassRange = audioDataArray.slice(0, 10);   // ~0-200Hz
+                const midRange = audioDataArray.slice(10, 100);  // ~200-2000Hz
+                const highRange = audioDataArray.slice(100, 512); // ~2kHz+
+
+                // Normalize to 0-1
+                bassEnergy = bassRange.reduce((a, b) => a + b, 0) / bassRange.length / 255.0;
+                midEnergy = midRange.reduce((a, b) => a + b, 0) / midRange.length / 255.0;
+                highEnergy = highRange.reduce((a, b) => a + b, 0) / highRange.length / 255.0;
+
+                // Sync local variables with window scope (in case refresh was clicked)
+                ripples = window.ripples;
+                lastBeatEnergy = window.lastBeatEnergy;
+                avgBeatDelta = window.avgBeatDelta;
+                globalAudioTime = window.globalAudioTime;
+
+                // TRANSIENT DETECTION (Ripple)
+                const beatEnergy = Math.max(bassEnergy, midEnergy);
+                const beatDelta = beatEnergy - lastBeatEnergy;
+
+                // Separate Deltas for Type Detection
+                // We need these to know IF it was a kick or a snare
+                // (Note: We still use max energy for the trigger threshold to keep it unified)
+                // But we could strictly calculate previous frame state if we really wanted precision.
+                // For now, simple comparison of current energy levels usually works because hits are distinct.
+                // Actually, let's look at which one DROVE the beatDelta.
+
+                // Adaptive Average Tracking - DECAY FIX
+                const activity = Math.max(0, beatDelta);
+                avgBeatDelta = avgBeatDelta * 0.95 + activity * 0.05;
+
+                // SAFETY CLAMP: Prevent threshold from running away on loud tracks
+                if (avgBeatDelta > 0.08) avgBeatDelta = 0.08;
+
+                // Dynamic Trigger - LOWER for more sensitivity
+                const dynamicThreshold = Math.max(0.002, avgBeatDelta * 1.2);
+
+                if (beatDelta > dynamicThreshold && beatEnergy > 0.05) { 
+                     // PERCUSSION HIT! Spawn a new ripple wave
+                     const rippleType = bassEnergy > midEnergy ? 'bass' : 'mid';
+                     // Strong intensity for both bass and mid
+                     const intensity = rippleType === 'bass' ? 0.5 : 0.5;
+
+                     // Add new ripple to pool
+                     window.ripples.push({
+                         birthTime: globalAudioTime,
+                         intensity: intensity,
+                         type: rippleType
+                     });
+
+                     // Keep pool size limited - remove oldest when full
+                     while (window.ripples.length > MAX_RIPPLES) {
+                         window.ripples.shift();
+                     }
+                }
+                lastBeatEnergy = beatEnergy;
+                window.lastBeatEnergy = lastBeatEnergy;
+
+                // Advance global audio time
+                globalAudioTime += smoothedDelta;
+                window.globalAudioTime = globalAudioTime;
+
+                // NaN SAFETY GUARD
+                if (isNaN(globalAudioTime)) {
+                    globalAudioTime = 0;
+                    window.globalAudioTime = 0;
+                }
+                if (isNaN(avgBeatDelta)) {
+                    avgBeatDelta = 0.01;
+                    window.avgBeatDelta = 0.01;
+                }
+
+                // Update ripple intensities with decay and remove dead ripples
+                window.ripples = window.ripples.filter(r => {
+                    r.intensity *= 0.96;  // Slightly slower decay for sustained waves
+                    return r.intensity > 0.005;  // Remove when too faint
+                });
+
+                // AUDIO CONTEXT WATCHDOG
+                // Ensure it didn't get suspended
+                 if (window.audioCtx && window.audioCtx.state === 'suspended') {
+                     window.audioCtx.resume();
+                 }
+
+                // Apply effects
+                // Bass thumps the zoom - INSTANT response (no smoothing)
+                // Lower threshold (0.2) + High multiplier (0.8) for observable "punch"
+                if (bassEnergy > 0.2) {
+                    audioZoomBoost = (bassEnergy - 0.2) * 0.8; 
+                }
+
+                // Mids/Highs speed up morphing - WITH RATE LIMITING
+                // Raw target boost (reduced multiplier from 8.0 to 4.0)
+                let targetMorphBoost = 1.0 + (midEnergy + highEnergy) * 4.0;
+
+                // CAP maximum morph boost to prevent excessive speed
+                targetMorphBoost = Math.min(targetMorphBoost, 3.0);  // Max 3x speed
+
+                // FAST SMOOTH for responsive audio while preventing jitter
+                // 70/30 blend responds in ~3 frames (~50ms) for tight beat sync
+                if (typeof window.smoothedMorphBoost === 'undefined') {
+                    window.smoothedMorphBoost = 1.0;
+                }
+                window.smoothedMorphBoost = window.smoothedMorphBoost * 0.7 + targetMorphBoost * 0.3;
+                audioMorphBoost = window.smoothedMorphBoost;
+
+                // Update Debug Text - REMOVED for final polish
+                /*
+                if (window.audioDebug) {
+                     // ... debug code removed for clean view ...
+                     if (window.audioDebug.parentNode) window.audioDebug.parentNode.removeChild(window.audioDebug);
+                     window.audioDebug = null;
+                }
+                */
+            }
+
+            // Apply settings intensity multipliers
+            const morphMultiplier = window.fractalSettings?.morphIntensity ?? 1.0;
+            const bassMultiplier = window.fractalSettings?.bassZoomIntensity ?? 1.0;
+
+            // Check if in observe mode - freeze all audio effects if so
+            const inObserveMode = window.morphState && window.morphState.mode === 'observe';
+
+            if (inObserveMode) {
+                // FROZEN: No audio effect on time during observe mode
+                accumulatedTime += smoothedDelta;  // Just regular time, no audio boost
+            } else {
+                accumulatedTime += smoothedDelta * (1.0 + (audioMorphBoost - 1.0) * morphMultiplier);
+            }
+
+            // PREVENT PRECISION LOSS: Wrap accumulatedTime for color cycling stability
+            // 1000 seconds is enough for any animation cycle to complete
+            if (accumulatedTime > 1000.0) {
+                accumulatedTime -= 1000.0;
+                console.log("TIME: Wrapped accumulatedTime to prevent precision loss");
+            }
+
+            // NOTE: Zoom accumulation is now handled by the adaptive zoom pause system below
+
+            const dpr = window.devicePixelRatio || 1;
+            const qualityScale = 1.0;  // FULL 4K RESOLUTION
+            const MAX_W = 4096;        // Unlocked for 4K
+            const MAX_H = 2160;
+            let targetW = Math.floor(canvas.clientWidth * dpr * qualityScale);
+            let targetH = Math.floor(canvas.clientHeight * dpr * qualityScale);
+            if (targetW > MAX_W) { targetH = Math.floor(targetH * (MAX_W / targetW)); targetW = MAX_W; }
+            if (targetH > MAX_H) { targetW = Math.floor(targetW * (MAX_H / targetH)); targetH = MAX_H; }
+
+            if (canvas.width !== targetW || canvas.height !== targetH) {
+                canvas.width = targetW;
+                canvas.height = targetH;
+                gl.viewport(0, 0, canvas.width, canvas.height);
+            }
+
+            // ========== MANDELBROT INFINITE ZOOM ==========
+            // Camera locked to Misiurewicz point - no boundary seeking needed!
+            // Always zoom in, seamless reset at precision limit
+
+            // Calculate zoom
+            const zoom = Math.exp(accumulatedZoomLog);
+
+            // DYNAMIC ZOOM LIMIT based on approaching iteration limits
+            // Slow down zoom as we approach the max iterations to prevent instability
+            const approachingLimit = accumulatedZoomLog > 25;  // Start slowing at ~10^10 zoom
+            let zoomSlowdown = 1.0;
+            if (approachingLimit) {
+                // Gradually reduce zoom rate as we go deeper
+                zoomSlowdown = Math.max(0.1, 1.0 - (accumulatedZoomLog - 25) / 20);
+            }
+
+            // Zoom rate (audio-reactive) with dynamic limit
+            let effectiveZoomRate = cfg.zoom.rate * zoomSlowdown;
+            if (isAudioActive && audioZoomBoost > 0) {
+                effectiveZoomRate += audioZoomBoost * bassMultiplier * zoomSlowdown;
+            }
+            // FAST ZOOM during reset transition (when zoom < 0, we're in blackness)
+            // 10x speed to quickly get from black to visible fractal
+            if (accumulatedZoomLog < 0) {
+                effectiveZoomRate *= 10.0;
+            }
+
+            // Always zoom in
+            accumulatedZoomLog += effectiveZoomRate * smoothedDelta;
+
+            let brightnessMultiplier = 1.0;  // Always full brightness
+
+            // Dynamic max iterations - sync with zoom log
+            // Use explicit fallbacks in case config doesn't load properly
+            const iterBaseCount = cfg.iteration?.baseCount || 300;
+            const iterLogMult = cfg.iteration?.logMultiplier || 100;  // Higher multiplier for deep zoom
+            let targetMaxIter = Math.floor(iterBaseCount + iterLogMult * accumulatedZoomLog);
+            if (targetMaxIter < 100) targetMaxIter = 100;   // Floor: minimum 100 iterations for zoomed out view
+            if (targetMaxIter > 9000) targetMaxIter = 9000;  // Cap at 9000 (we have 10000 reference points)
+
+            // SMOOTHED ITERATION COUNT - prevents flickering from discrete jumps
+            // Initialize smoothed value on first run
+            if (typeof window.smoothedMaxIter === 'undefined') {
+                window.smoothedMaxIter = targetMaxIter;
+            }
+            // Use 98/2 blend for very gradual transitions (changes spread over ~50 frames)
+            window.smoothedMaxIter = window.smoothedMaxIter * 0.98 + targetMaxIter * 0.02;
+            let gpuMaxIter = Math.floor(window.smoothedMaxIter);
+
+            window.currentGpuMaxIter = gpuMaxIter;  // Store for debug access
+
+            // ===== DEBUG: Zoom level display (removed reset for testing) =====
+            // Press SPACE to pause/resume zoom and see the current level
+            if (typeof window.zoomPaused === 'undefined') {
+                window.zoomPaused = false;
+                document.addEventListener('keydown', (e) => {
+                    if (e.code === 'Space') {
+                        window.zoomPaused = !window.zoomPaused;
+                        const zoomFactor = Math.exp(accumulatedZoomLog);
+                        const ms = window.morphState || {};
+
+                        console.log(`=== ZOOM ${window.zoomPaused ? 'PAUSED' : 'RESUMED'} ===`);
+                        console.log(`  accumulatedZoomLog: ${accumulatedZoomLog.toFixed(4)}`);
+                        console.log(`  Zoom factor: ${zoomFactor.toExponential(3)} (${zoomFactor.toLocaleString()}x)`);
+                        console.log(`  Max iterations: ${window.currentGpuMaxIter}`);
+                        console.log(`--- MORPH STATE ---`);
+                        console.log(`  Mode: ${ms.mode || 'N/A'}`);
+                        console.log(`  morphTime: ${(ms.morphTime || 0).toFixed(4)}`);
+                        console.log(`  smoothedBlend: ${(ms.smoothedBlend || 0).toFixed(4)}`);
+                        console.log(`  smoothedSpeed: ${(ms.smoothedSpeed || 0).toFixed(6)}`);
+                        console.log(`  freezeTimer: ${(ms.freezeTimer || 0).toFixed(2)}s`);
+                        console.log(`  lastBrightness: ${(ms.lastBrightness || 0).toFixed(1)}`);
+                        console.log(`--- COPY-PASTE VALUES ---`);
+                        console.log(JSON.stringify({
+                            zoomLog: parseFloat(accumulatedZoomLog.toFixed(4)),
+                            morphTime: parseFloat((ms.morphTime || 0).toFixed(4)),
+                            blend: parseFloat((ms.smoothedBlend || 0).toFixed(4)),
+                            time: parseFloat(accumulatedTime.toFixed(2))
+                        }));
+                    }
+                });
+                console.log("DEBUG: Press SPACE to pause zoom and see current level");
+            }
+
+            // Skip zoom increment if paused
+            if (window.zoomPaused) {
+                accumulatedZoomLog -= effectiveZoomRate * smoothedDelta; // Undo the increment
+            }
+
+            // ===== PROACTIVE ZOOM RESET =====
+            // Trigger seamless reset BEFORE precision issues cause instability
+            // Misiurewicz points are self-similar, so the pattern repeats at lower zoom
+            if (accumulatedZoomLog > REBASE_THRESHOLD && accumulatedZoomLog - lastRebaseZoom > REBASE_COOLDOWN) {
+                console.log(`ZOOM RESET: accumulatedZoomLog=${accumulatedZoomLog.toFixed(2)} > threshold=${REBASE_THRESHOLD}`);
+                resetZoomSeamlessly();
+
+                // Also reset morph state to prevent accumulated artifacts
+                if (window.morphState) {
+                    window.morphState.morphTime = 0;
+                    window.morphState.smoothedBlend = 0.5;
+                    window.morphState.mode = 'explore';
+                    window.morphState.modeSwitchCooldown = 10.0;  // 10 second cooldown before observe mode can activate
+                }
+
+                // Reset black screen detection state
+                window.blackScreenStartTime = 0;
+                window.blackScreenTotalTime = 0;
+                window.autoMorphBoost = 0;
+            }
+
+            gl.uniform2f(locRes, canvas.width, canvas.height);
+            gl.uniform1f(locTime, accumulatedTime);
+            gl.uniform1f(locBrightness, brightnessMultiplier);  // Fade transition
+
+            // Pass morph intensity for fractal structure evolution
+            const morphIntensity = window.fractalSettings?.morphIntensity ?? 1.0;
+            gl.uniform1f(locMorphIntensity, morphIntensity);
+
+            // For perturbation, u_zoom is just the zoom factor (float)
+            // We use log zoom usually, so zoom = exp(log_zoom)
+            // But passing as vec2 (x,y) if used for aspect? No, shader uses u_zoom as vec2?
+            // Shader: uniform vec2 u_zoom;
+            // Code: vec2 pixel_delta_c = uv / u_zoom;
+            // So u_zoom should be vec2(zoom, zoom)? Or just float?
+            // Let's pass vec2(zoom, zoom)
+            gl.uniform2f(locZoom, zoom, zoom);
+
+            // Delta C: u_deltaC = Center - RefCenter
+            // In this initial version, Reference Center IS the Center, so deltaC = 0
+            // If we pan, we update this.
+            // Assuming we haven't moved far:
+
+            // Hardcoded initial center matching Python
+            // (-0.743643887037158704752191506114774, 0.131825904205311970493132056385139)
+            // CenterX, CenterY in JS are likely 0,0 or something simple if we didn't init them.
+            // Wait, centerX/centerY are updated by mouse/keys.
+            // We need to calculate the difference.
+            // BUT JS doesn't have high precision 'centerX'.
+            // So we can only pan a tiny bit before we need REBASE.
+            // For "Testing", let's assume DeltaC is 0 for now (perfect center match).
+            gl.uniform2f(locDeltaC, 0.0, 0.0); 
+
+            gl.uniform1i(locMaxIter, gpuMaxIter);
+
+            // Bind Textures - PRIMARY ORBIT
+            if (texRefRe && texRefIm) {
+                gl.activeTexture(gl.TEXTURE0);
+                gl.bindTexture(gl.TEXTURE_2D, texRefRe);
+                gl.uniform1i(locRefRe, 0);
+
+                gl.activeTexture(gl.TEXTURE1);
+                gl.bindTexture(gl.TEXTURE_2D, texRefIm);
+                gl.uniform1i(locRefIm, 1);
+
+                gl.uniform1i(locRefCount, refCount);
+            }
+
+            // Bind Textures - SECONDARY ORBIT (for blending)
+            if (texRefRe2 && texRefIm2) {
+                gl.activeTexture(gl.TEXTURE2);
+                gl.bindTexture(gl.TEXTURE_2D, texRefRe2);
+                gl.uniform1i(locRefRe2, 2);
+
+                gl.activeTexture(gl.TEXTURE3);
+                gl.bindTexture(gl.TEXTURE_2D, texRefIm2);
+                gl.uniform1i(locRefIm2, 3);
+
+                gl.uniform1i(locRefCount2, refCount2);
+            }
+
+            // ===== COMPLEXITY-ADAPTIVE MORPH SYSTEM =====
+            // Combines: (1) brightness-adaptive speed, (2) sticky freeze, (3) explore/observe mode
+
+            // Initialize morph state variables on first run
+            if (typeof window.morphState === 'undefined') {
+                window.morphState = {
+                    mode: 'explore',           // 'explore' = searching, 'observe' = viewing complexity
+                    frozenBlend: 0.5,          // Blend value when frozen
+                    freezeTimer: 0,            // Seconds remaining in freeze
+                    lastBrightness: 0,         // For smoothing
+                    morphTime: 0,              // Independent morph time accumulator
+                    observeThreshold: 60,      // Brightness above this = complex
+                    exploreThreshold: 20,      // Brightness below this = boring (raised from 10)
+                    freezeDuration: 20.0,      // How long to freeze when complexity found (seconds)
+                    smoothedBlend: 0.5,        // Output-smoothed blend to prevent jitter
+                    smoothedSpeed: 0.5,        // Smoothed effective speed to prevent velocity jumps
+                    modeSwitchCooldown: 0,     // Cooldown timer to prevent rapid mode switching
+                    randomPhase: Math.random() * 628.0,  // Random starting phase for variety
+                    secondaryPhase: Math.random() * 314.0,  // Secondary oscillation phase
+                };
+                console.log(`MORPH: Initialized with random phases: ${window.morphState.randomPhase.toFixed(2)}, ${window.morphState.secondaryPhase.toFixed(2)}`);
+            }
+            const ms = window.morphState;
+
+            // Sample brightness was already calculated in black screen detection
+            // but we need it BEFORE draw for morph calc, so we use last frame's value
+            // (slight lag is fine for this smooth effect)
+            const currentBrightness = ms.lastBrightness;
+
+            // Complexity score: 0 = black/boring, 1 = bright/complex
+            const complexityScore = Math.min(1.0, currentBrightness / 128.0);
+
+            // Decrement mode switch cooldown
+            if (ms.modeSwitchCooldown > 0) {
+                ms.modeSwitchCooldown -= smoothedDelta;
+            }
+
+            // FORCE EXPLORE MODE when zooming in from reset (zoom < 0)
+            // This prevents observing during the initial black-to-fractal transition
+            if (accumulatedZoomLog < 0 && ms.mode !== 'explore') {
+                ms.mode = 'explore';
+                console.log('MORPH: Forcing EXPLORE mode during zoom-in from reset');
+            }
+
+            // MODE TRANSITIONS with hysteresis AND cooldown
+            // Can only switch modes when cooldown has elapsed AND zoom >= 0
+            if (ms.modeSwitchCooldown <= 0 && accumulatedZoomLog >= 0) {
+                if (ms.mode === 'explore') {
+                    // In explore mode: looking for complexity
+                    if (currentBrightness > ms.observeThreshold) {
+                        // Found complexity! Switch to observe mode
+                        console.log(`MORPH: Found complexity (brightness=${currentBrightness.toFixed(1)}) - switching to OBSERVE mode`);
+                        ms.mode = 'observe';
+                        ms.frozenBlend = (Math.sin(ms.morphTime * 0.1 * morphIntensity) + 1.0) * 0.5;
+                        ms.freezeTimer = ms.freezeDuration;
+                        ms.modeSwitchCooldown = 2.0;  // 2 second cooldown before can switch again
+                    }
+                } else {
+                    // In observe mode: showing complexity
+                    if (ms.freezeTimer > 0) {
+                        ms.freezeTimer -= smoothedDelta;
+                    } else if (currentBrightness < ms.exploreThreshold) {
+                        // Lost complexity, switch back to explore
+                        console.log(`MORPH: Lost complexity (brightness=${currentBrightness.toFixed(1)}) - switching to EXPLORE mode`);
+                        ms.mode = 'explore';
+                        ms.modeSwitchCooldown = 2.0;  // 2 second cooldown before can switch again
+                    }
+                }
+            }
+
+            // Calculate morph speed based on mode and complexity
+            const baseMorphSpeed = 0.1;
+            let targetMorphSpeed;
+            if (ms.mode === 'explore') {
+                // Explore: Slow morph to reliably catch complexity (1.5x for detection sync)
+                targetMorphSpeed = baseMorphSpeed * 1.5;
+            } else {
+                // Observe: FREEZE morph completely to enjoy the complexity
+                targetMorphSpeed = 0.0;
+            }
+            // SMOOTHED SPEED TRANSITION - 80/20 for faster response while still smooth
+            ms.smoothedSpeed = ms.smoothedSpeed * 0.8 + targetMorphSpeed * 0.2;
+            let effectiveMorphSpeed = ms.smoothedSpeed;
+
+            // Apply morph intensity multiplier
+            effectiveMorphSpeed *= morphIntensity;
+
+            // Accumulate morph time (independent of zoom time)
+            ms.morphTime += smoothedDelta * effectiveMorphSpeed / baseMorphSpeed;
+
+            // PREVENT PRECISION LOSS: Wrap morphTime to avoid unbounded growth
+            // 628 = 100 * 2*PI, so sin() cycles seamlessly at this point
+            if (ms.morphTime > 628.0) {
+                ms.morphTime -= 628.0;
+                console.log("MORPH: Time wrapped to prevent precision loss");
+            }
+
+            // Calculate base morph blend
+            let morphBlend;
+            if (ms.mode === 'observe' && ms.freezeTimer > 0) {
+                // FROZEN: use saved blend value with very subtle drift
+                const driftAmount = (ms.freezeDuration - ms.freezeTimer) * 0.01;
+                morphBlend = ms.frozenBlend + Math.sin(driftAmount) * 0.02;
+            } else {
+                // COMPLEX OSCILLATION using multiple frequencies for variety
+                // Primary wave (slow) + secondary wave (faster) + random phase offset
+                const t = ms.morphTime + ms.randomPhase;
+                const primary = Math.sin(t * baseMorphSpeed) * 0.4;           // Main slow wave
+                const secondary = Math.sin(t * baseMorphSpeed * 2.7 + ms.secondaryPhase) * 0.3;  // Faster wave
+                const tertiary = Math.sin(t * baseMorphSpeed * 0.37) * 0.2;   // Very slow modulation
+                morphBlend = 0.5 + primary + secondary + tertiary;
+                morphBlend = Math.max(0.0, Math.min(1.0, morphBlend));  // Clamp to 0-1
+            }
+
+            // Add auto-boost from black screen detection (existing system)
+            const autoBoost = window.autoMorphBoost || 0;
+            morphBlend = Math.min(1.0, Math.max(0.0, morphBlend + autoBoost));
+
+            // FINAL OUTPUT SMOOTHING - prevents ALL jitter by smoothing the actual value sent to shader
+            // 90/10 blend provides responsive but smooth transitions without visible jumps
+            ms.smoothedBlend = ms.smoothedBlend * 0.9 + morphBlend * 0.1;
+
+            gl.uniform1f(locMorphBlend, ms.smoothedBlend);
+
+            // Populate ripple uniforms with top 4 ripples (sorted by intensity)
+            const rippleMultiplier = window.fractalSettings?.rippleIntensity ?? 1.0;
+            const sortedRipples = [...window.ripples].sort((a, b) => b.intensity - a.intensity).slice(0, 4);
+            for (let i = 0; i < 4; i++) {
+                if (i < sortedRipples.length) {
+                    const r = sortedRipples[i];
+                    const timeSinceBirth = globalAudioTime - r.birthTime;
+                    gl.uniform4f(locRipples[i], timeSinceBirth, r.intensity * rippleMultiplier, 0.0, 0.0);
+                } else {
+                    gl.uniform4f(locRipples[i], 0.0, 0.0, 0.0, 0.0);  // Empty slot
+                }
+            }
+
+            gl.drawArrays(gl.TRIANGLES, 0, 6);
+
+            // ===== BLACK SCREEN DETECTION =====
+            // Reset zoom if screen is black for more than 1 second
+            if (typeof window.blackScreenStartTime === 'undefined') {
+                window.blackScreenStartTime = 0;
+                window.blackScreenDebugCounter = 0;
+            }
+
+            // Sample multiple pixels to check if black - use 9-point grid for better coverage
+            const pixels = new Uint8Array(4);
+            let totalBrightness = 0;
+
+            // Sample 9 points in a 3x3 grid for better complexity detection
+            const samplePoints = [
+                [Math.floor(canvas.width/4), Math.floor(canvas.height/4)],
+                [Math.floor(canvas.width/2), Math.floor(canvas.height/4)],
+                [Math.floor(canvas.width*3/4), Math.floor(canvas.height/4)],
+                [Math.floor(canvas.width/4), Math.floor(canvas.height/2)],
+                [Math.floor(canvas.width/2), Math.floor(canvas.height/2)],
+                [Math.floor(canvas.width*3/4), Math.floor(canvas.height/2)],
+                [Math.floor(canvas.width/4), Math.floor(canvas.height*3/4)],
+                [Math.floor(canvas.width/2), Math.floor(canvas.height*3/4)],
+                [Math.floor(canvas.width*3/4), Math.floor(canvas.height*3/4)],
+            ];
+
+            for (const [x, y] of samplePoints) {
+                gl.readPixels(x, y, 1, 1, gl.RGBA, gl.UNSIGNED_BYTE, pixels);
+                totalBrightness += (pixels[0] + pixels[1] + pixels[2]) / 3;
+            }
+            const avgBrightness = totalBrightness / samplePoints.length;
+
+            // SMOOTH brightness to catch transient complexity during morph
+            // 70/30 blend - responsive but catches brief bright frames
+            if (window.morphState) {
+                const prevBrightness = window.morphState.lastBrightness || avgBrightness;
+                // Use MAX of current and smoothed to catch ANY complexity
+                window.morphState.lastBrightness = Math.max(
+                    avgBrightness,  // Current frame
+                    prevBrightness * 0.7 + avgBrightness * 0.3  // Smoothed
+                );
+            }
+
+            // Debug logging every 60 frames (~1 second)
+            window.blackScreenDebugCounter++;
+            if (window.blackScreenDebugCounter >= 60) {
+                window.blackScreenDebugCounter = 0;
+                if (avgBrightness < 10) {
+                    console.log(`BLACK SCREEN CHECK: brightness=${avgBrightness.toFixed(1)}, timer=${window.blackScreenStartTime > 0 ? ((performance.now() - window.blackScreenStartTime)/1000).toFixed(1) + 's' : 'not started'}`);
+                }
+            }
+
+            // BLACK SCREEN thresholds with hysteresis to prevent oscillation
+            const BLACK_TRIGGER = 15;   // Treat brightness < 15 as black
+            const BLACK_RECOVER = 50;   // Must be this bright to cancel
+
+            // STARTUP DELAY: Don't trigger black screen detection for first 10 seconds
+            // This allows the initial zoom-in to proceed without interference
+            const timeSinceStartup = (performance.now() - startupTime) / 1000;
+            const blackScreenEnabled = timeSinceStartup > 10;
+
+            // COOLDOWN: Don't re-trigger for 2 seconds after complexity was restored
+            const blackScreenCooldownElapsed = !window.blackScreenCooldown || 
+                (performance.now() - window.blackScreenCooldown) > 2000;
+
+            if (blackScreenEnabled && blackScreenCooldownElapsed && avgBrightness < BLACK_TRIGGER) {  // Very dark
+                if (window.blackScreenStartTime === 0) {
+                    window.blackScreenStartTime = performance.now();
+                    window.blackScreenTotalTime = performance.now();
+                    window.autoMorphBoost = window.autoMorphBoost || 0;
+                    console.log("BLACK SCREEN: Timer started, will boost morph");
+                } else if (performance.now() - window.blackScreenStartTime > 500) {
+                    // Black for more than 0.5 seconds - increase morph to find complexity
+                    window.autoMorphBoost = (window.autoMorphBoost || 0) + 0.02;
+                    if (window.autoMorphBoost > 1.0) window.autoMorphBoost = 1.0;
+                    console.log(`BLACK SCREEN: Boosting morph blend to ${window.autoMorphBoost.toFixed(2)}`);
+                    window.blackScreenStartTime = performance.now();  // Reset timer to keep boosting
+
+                    // FALLBACK: If morph boosting has been active for 5+ seconds, reset zoom
+                    const totalBlackTime = (performance.now() - window.blackScreenTotalTime) / 1000;
+                    if (totalBlackTime > 5) {
+                        console.log("=== FALLBACK: Morph failed after 5 seconds - ZOOM RESET ===");
+                        accumulatedZoomLog = -5;  // Reset to blackness for seamless transition
+                        startupTime = performance.now();  // Reset startup delay
+                        window.autoMorphBoost = 0;
+                        window.blackScreenStartTime = 0;
+                        window.blackScreenTotalTime = 0;
+                    }
+                }
+            } else if (avgBrightness > BLACK_RECOVER) {  // Brightness returned - with hysteresis
+                if (window.blackScreenStartTime > 0) {
+                    console.log("COMPLEXITY RESTORED: morph boost cancelled");
+                    window.blackScreenCooldown = performance.now();  // Start cooldown
+                }
+                window.blackScreenStartTime = 0;
+                // Slowly decay the auto morph boost when complexity returns
+                if (window.autoMorphBoost > 0) {
+                    window.autoMorphBoost -= 0.01;  // Faster decay
+                    if (window.autoMorphBoost < 0) window.autoMorphBoost = 0;
+                }
+            }
+            // Note: brightness between BLACK_TRIGGER and BLACK_RECOVER = HOLD current state (hysteresis)
+
+            requestAnimationFrame(render);
+        }
+        requestAnimationFrame((t) => {
+            lastFrameTime = t;
+            requestAnimationFrame(render);
+        });
+        console.log("FRACTAL RUNNING");
+    }
+
+    const attempt = () => {
+        if (document.body) { start(); }
+        else { setTimeout(attempt, 500); }
+    };
+    attempt();
+})();